@@ -3,6 +3,7 @@
 ###############
 
 # standard python imports
+import os
 import streamlit as st
 from streamlit_option_menu import option_menu  # type: ignore
 import pandas as pd
@@ -11,9 +12,30 @@ import altair as alt
 # customer streamlit views
 from views.background import render_view as render_background
 from views.overview import render_view as render_overview
+from views.overview import warm_up as warm_up_overview
 from views.label_evaluation import render_view as render_label_evaluation
+from views.label_evaluation import COLUMNS as label_evaluation_columns
+from views.label_evaluation import warm_up as warm_up_label_evaluation
 from views.outcome_analysis import render_view as render_outcome_analysis
+from views.outcome_analysis import warm_up as warm_up_outcome_analysis
 from views.raw_data import render_view as render_raw_data
+from views.admin import render_view as render_admin
+
+# data loading helpers
+from utils.ingest import load_narrow_columns, load_text_columns, source_hash
+from utils.filter_index import FilterIndex
+from utils.cube import MetricsCube
+from utils.metrics import compute_metrics, filter_state_key
+from utils.alignment import AlignmentEngine, compute_alignment
+from utils.search_index import SearchIndex
+from utils.selection import RowSelection
+from utils.result_cache import result_cache
+from utils.result_store import ResultStore
+from utils.warmup import WarmUp, filter_states, load_presets
+from utils.profiling import begin_run, render_run_log, section, span, SHOW_RUNS
+
+# copy-on-write: slices and projections share memory with the cached dataset until written to
+pd.options.mode.copy_on_write = True
 
 
 ###################
@@ -26,6 +48,9 @@ dash_name = "Service Checker Call Label Modelling"
 # layout and tab title
 st.set_page_config(layout="wide", page_title=dash_name)
 
+# every full run starts a new entry in the section run log (fragment reruns skip this script)
+begin_run()
+
 # markdown for bootstrap icons
 st.markdown(
     """
@@ -40,28 +65,108 @@ st.markdown(
 ### load and cache data ###
 ###########################
 
-# load functions
-@st.cache_data
-def load_label_data():
-    df = pd.read_csv(
-        "data/aug_nov_50k_calls_all_data_v2.csv",
-        dtype={
-            "other_label": "string",
-            "engineer_reported_cause": "string",
-            "engineer_reported_symptom": "string",
-            "engineer_reported_action": "string"
-        }
-    )
-    df["call_date"] = pd.to_datetime(df["call_date"]).dt.date
-    return df
+# source data (DASHBOARD_DATA_PATH points the dashboard at another extract, e.g. a synthetic
+# dataset from utils/synthetic.py)
+DATA_PATH = os.environ.get("DASHBOARD_DATA_PATH", "data/aug_nov_50k_calls_all_data_v2.csv")
 
-# load data
-df_label = load_label_data()
+# load functions (cache_resource shares one read-only frame across reruns and
+# sessions instead of unpickling a fresh copy on every call)
+@st.cache_resource
+def load_label_data():
+    # reads the narrow columns from a parquet copy of the csv, converting it once per content change
+    return load_narrow_columns(DATA_PATH)
+
+@st.cache_resource
+def load_text_data():
+    # wide free-text columns, only loaded once a view needs them
+    return load_text_columns(DATA_PATH)
+
+@st.cache_resource
+def load_dataset_key():
+    # content hash of the source csv (from the ingest manifest), identifying the dataset in
+    # the cache keys of results computed from its rows
+    return source_hash(DATA_PATH)
+
+@st.cache_resource
+def load_filter_index():
+    # built once per dataset load and shared read-only across sessions
+    return FilterIndex(load_label_data())
+
+@st.cache_resource
+def load_metrics_cube():
+    # label x outcome x day counts and sums behind the kpi cards and summary tables
+    return MetricsCube(load_label_data())
+
+@st.cache_resource
+def load_alignment_engine():
+    # label, confidence and reference codes behind the label evaluation confusion matrices
+    return AlignmentEngine(load_label_data(), fingerprint=load_dataset_key())
+
+@st.cache_resource
+def load_search_index():
+    # inverted text index for the raw data search box, built on first use
+    return SearchIndex(pd.concat([load_label_data(), load_text_data()], axis=1))
+
+@st.cache_resource
+def load_result_store():
+    # computed aggregates on disk for the current source content, reloaded after restarts
+    return ResultStore(DATA_PATH)
+
+# load data (timed: the first run of a process reads the dataset and builds the indexes)
+with span("app.load_data"):
+    df_label = load_label_data()
+    filter_index = load_filter_index()
+    metrics_cube = load_metrics_cube()
+
+# results missing from the shared result cache are looked up on disk before being computed
+result_cache().attach_store(load_result_store())
+
+
+#####################
+### cache warm-up ###
+#####################
+
+# compute every view's default results at server start, for the default filters and the
+# presets in warmup_presets.json, on a background thread (DASHBOARD_WARMUP=0 turns it off)
+WARMUP_ENABLED = os.environ.get("DASHBOARD_WARMUP", "1") != "0"
+
+# what each view computes for one filter state with its default widget settings; the thread
+# runs it with the shared resources it needs already built, as cache_resource loaders want
+# a script run context the thread does not have
+def warm_views(state, dataset_key, engine):
+    filters = (state["labels"], state["outcomes"], state["start_date"], state["end_date"])
+    state_key = filter_state_key(*filters, dataset=dataset_key)
+    total_all = len(df_label)
+
+    metrics = compute_metrics(metrics_cube, *filters)
+    warm_up_overview(metrics, state_key, total_all)
+    warm_up_outcome_analysis(metrics, state_key, total_all)
+
+    alignment = compute_alignment(engine, filter_index, *filters)
+    selection = RowSelection(df_label, filter_index.resolve(*filters))
+    warm_up_label_evaluation(selection.take(label_evaluation_columns), alignment, state_key)
+
+@st.cache_resource
+def start_warm_up():
+    # once per server process; the same default filters the sidebar starts from
+    default = {
+        "labels": sorted(df_label["label"].dropna().unique().tolist()),
+        "outcomes": sorted(df_label["selected_outcome_cleaned"].dropna().unique().tolist()),
+        "start_date": df_label["call_date"].min().date(),
+        "end_date": df_label["call_date"].max().date(),
+    }
+    dataset_key, engine = load_dataset_key(), load_alignment_engine()
+    return WarmUp([
+        (name, lambda state=state: warm_views(state, dataset_key, engine))
+        for name, state in filter_states(default, load_presets())
+    ]).start()
+
+warm_up = start_warm_up() if WARMUP_ENABLED else None
 
 # store variable with total rows
 st.session_state["df_label_total_rows"] = len(df_label)
-st.session_state["df_label_min_dt"] = df_label["call_date"].min()
-st.session_state["df_label_max_dt"] = df_label["call_date"].max()
+st.session_state["df_label_min_dt"] = df_label["call_date"].min().date()
+st.session_state["df_label_max_dt"] = df_label["call_date"].max().date()
 
 # set distinct outcomes
 st.session_state["global_outcomes"] = df_label["selected_outcome_cleaned"].dropna().unique()
@@ -102,6 +207,10 @@ if AUTH_ENABLED:
 else:
     st.session_state.authenticated = True
 
+# show the admin page (server memory, caches and every live session's filters) in the
+# navigation; off unless DASHBOARD_ADMIN=1, as it exposes server internals to every user
+ADMIN_ENABLED = os.environ.get("DASHBOARD_ADMIN", "0") == "1"
+
 # only view if authenticated
 if st.session_state.authenticated:
 
@@ -142,18 +251,89 @@ if st.session_state.authenticated:
     if "end_date" not in st.session_state:
         st.session_state.end_date = max_date
 
+    # keep the dates when their widgets are not drawn (background view, batch filter mode)
+    st.session_state.start_date = st.session_state.start_date
+    st.session_state.end_date = st.session_state.end_date
+
+    # filter keys applied to the views and their staged copies in batch mode
+    FILTER_KEYS = ["selected_labels", "selected_outcomes", "start_date", "end_date"]
+    STAGED_KEYS = {key: f"staged_{key}" for key in FILTER_KEYS}
+
+    # staged copies restart from the applied filters whenever batch mode is switched or reset
+    def clear_staged_filters():
+        for staged_key in STAGED_KEYS.values():
+            st.session_state.pop(staged_key, None)
+
+    # batch mode: edits rerun only this panel, which previews the matching row count from the
+    # filter index, and the views only rerun once the staged filters are applied
+    @section("sidebar.staged_filters")
+    def staged_filters():
+        for key, staged_key in STAGED_KEYS.items():
+            if staged_key not in st.session_state:
+                st.session_state[staged_key] = st.session_state[key]
+
+        st.date_input(
+            "Start of period:",
+            min_value=min_date,
+            max_value=max_date,
+            key="staged_start_date"
+        )
+
+        st.date_input(
+            "End of period:",
+            min_value=min_date,
+            max_value=max_date,
+            key="staged_end_date"
+        )
+
+        st.multiselect(
+            f"Select call issue labels ({len(st.session_state.staged_selected_labels)} selected):",
+            options=label_options,
+            key="staged_selected_labels"
+        )
+
+        st.multiselect(
+            f"Select outcomes ({len(st.session_state.staged_selected_outcomes)} selected):",
+            options=outcome_options,
+            key="staged_selected_outcomes"
+        )
+
+        # live preview of the staged filters (slice bounds only, the frame is not touched)
+        staged = {key: st.session_state[staged_key] for key, staged_key in STAGED_KEYS.items()}
+        pending = any(staged[key] != st.session_state[key] for key in FILTER_KEYS)
+        st.caption(f"{filter_index.count(*staged.values()):,} calls match the staged filters")
+
+        if st.button("Apply filters", type="primary", disabled=not pending, width="stretch"):
+            for key in FILTER_KEYS:
+                st.session_state[key] = staged[key]
+            st.rerun()
+
+    # views and their menu icons (the admin page last, when enabled)
+    views = {
+        "Background": "info-circle",
+        "Overview": "card-checklist",
+        "Label Evaluation": "speedometer2",
+        "Outcome Analysis": "table",
+        "Raw Label Data": "database",
+    }
+    if ADMIN_ENABLED:
+        views["Admin"] = "cpu"
+
+    # views that show the full dataset, without the global filters
+    UNFILTERED_VIEWS = ["Background", "Admin"]
+
     # sidebar to navigate views
     with st.sidebar:
         selected_view = option_menu(
             menu_title="Sections",
-            options=["Background", "Overview", "Label Evaluation", "Outcome Analysis", "Raw Label Data"],
-            icons=["info-circle", "card-checklist", "speedometer2", "table", "database"],
+            options=list(views),
+            icons=list(views.values()),
             menu_icon="layers",
             default_index=0,
             key="selected_view"
         )
 
-        if selected_view != "Background":
+        if selected_view not in UNFILTERED_VIEWS:
 
             # global filters (only for non-overview views)
             st.write("")
@@ -164,68 +344,133 @@ if st.session_state.authenticated:
                 st.session_state.selected_outcomes = outcome_options
                 st.session_state.start_date = min_date
                 st.session_state.end_date = max_date
-
-            # Date filters
-            st.date_input(
-                "Start of period:",
-                min_value=min_date,
-                max_value=max_date,
-                key="start_date"
-            )
-
-            st.date_input(
-                "End of period:",
-                min_value=min_date,
-                max_value=max_date,
-                key="end_date"
+                clear_staged_filters()
+
+            # batch mode stages filter edits and applies them together
+            batch_filters = st.toggle(
+                "Batch filter changes",
+                key="batch_filters",
+                on_change=clear_staged_filters,
+                help="Stage several filter edits, preview how many calls match, then apply them in one go."
             )
 
-            # call issue label filter
-            st.multiselect(
-                f"Select call issue labels ({len(st.session_state.selected_labels)} selected):",
-                options=label_options,
-                key="selected_labels"
-            )
+            if batch_filters:
+                staged_filters()
 
-            # selected outcome filter
-            st.multiselect(
-                f"Select outcomes ({len(st.session_state.selected_outcomes)} selected):",
-                options=outcome_options,
-                key="selected_outcomes"
-            )
+            else:
+                # Date filters
+                st.date_input(
+                    "Start of period:",
+                    min_value=min_date,
+                    max_value=max_date,
+                    key="start_date"
+                )
+
+                st.date_input(
+                    "End of period:",
+                    min_value=min_date,
+                    max_value=max_date,
+                    key="end_date"
+                )
+
+                # call issue label filter
+                st.multiselect(
+                    f"Select call issue labels ({len(st.session_state.selected_labels)} selected):",
+                    options=label_options,
+                    key="selected_labels"
+                )
+
+                # selected outcome filter
+                st.multiselect(
+                    f"Select outcomes ({len(st.session_state.selected_outcomes)} selected):",
+                    options=outcome_options,
+                    key="selected_outcomes"
+                )
+
+    # apply filters (background and admin show the full dataset)
+    with span("app.filters"):
+        # canonical key of the filter state for the views' cached results
+        state_key = filter_state_key(
+            st.session_state.selected_labels,
+            st.session_state.selected_outcomes,
+            st.session_state.start_date,
+            st.session_state.end_date,
+            dataset=load_dataset_key()
+        )
 
-    # apply filters
-    if selected_view == "Background":
-        df_filtered = df_label.copy()
-    else:
-        df_filtered = df_label[
-            (df_label["label"].isin(st.session_state.selected_labels)) &
-            (df_label["selected_outcome_cleaned"].isin(st.session_state.selected_outcomes)) &
-            (df_label["call_date"].between(
+        if selected_view in ["Overview", "Outcome Analysis"]:
+            # kpis and summary tables come from cached grouping sets over the pre-aggregated cube
+            metrics = compute_metrics(
+                metrics_cube,
+                st.session_state.selected_labels,
+                st.session_state.selected_outcomes,
                 st.session_state.start_date,
                 st.session_state.end_date
-            ))
-        ]
+            )
+
+        elif selected_view not in UNFILTERED_VIEWS:
+            # resolve row positions from the precomputed filter index
+            selection = RowSelection(
+                df_label,
+                filter_index.resolve(
+                    st.session_state.selected_labels,
+                    st.session_state.selected_outcomes,
+                    st.session_state.start_date,
+                    st.session_state.end_date
+                )
+            )
 
     # dynamic title change for each view
     st.title(
         "Service Checker Call Label Modelling"
         if selected_view == "Background"
+        else "Admin: Memory and Sessions"
+        if selected_view == "Admin"
         else selected_view
     )
 
     # view selection
-    if selected_view == "Background":
-        render_background(df_label)
-
-    elif selected_view == "Overview":
-        render_overview(df_filtered)
-
-    elif selected_view == "Label Evaluation":
-        render_label_evaluation(df_filtered)
-
-    elif selected_view == "Outcome Analysis":
-        render_outcome_analysis(df_filtered)
+    with span("app.render_view"):
+        if selected_view == "Background":
+            render_background(df_label)
+
+        elif selected_view == "Overview":
+            render_overview(metrics, state_key)
+
+        elif selected_view == "Label Evaluation":
+            # confusion counts for every reference come from the cache, keyed by the filter state
+            with span("app.alignment"):
+                alignment = compute_alignment(
+                    load_alignment_engine(),
+                    filter_index,
+                    st.session_state.selected_labels,
+                    st.session_state.selected_outcomes,
+                    st.session_state.start_date,
+                    st.session_state.end_date
+                )
+
+            # only the columns the view declares are taken for the filtered rows
+            render_label_evaluation(selection.take(label_evaluation_columns), alignment, state_key)
+
+        elif selected_view == "Outcome Analysis":
+            render_outcome_analysis(metrics, state_key)
+
+        elif selected_view == "Raw Label Data":
+            render_raw_data(selection, load_search_index, load_text_data(), state_key)
+
+        elif selected_view == "Admin" and ADMIN_ENABLED:
+            # shared resources sized on every run, lazily loaded ones only on request
+            render_admin(
+                df_label,
+                filter_index,
+                {"dataset": df_label, "filter index": filter_index, "metrics cube": metrics_cube},
+                {"alignment engine": load_alignment_engine, "text columns": load_text_data, "search index": load_search_index},
+                warm_up
+            )
 
-    elif selected_view == "Raw Label Data":
-        render_raw_data(df_filtered)
\ No newline at end of file
+    # profiler: which view sections ran on each interaction and how long each timed span took
+    with st.sidebar:
+        st.write("")
+        with st.expander("Profiler", expanded=False):
+            st.toggle("Show run captions in each section", key=SHOW_RUNS)
+            render_run_log()
\ No newline at end of file
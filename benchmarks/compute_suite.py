@@ -0,0 +1,213 @@
+# wall time of every headless compute function behind the views (utils/compute.py and the
+# index, cube, alignment and risk helpers it starts from) at several dataset sizes, compared
+# against a json baseline so regressions show up before they reach the dashboard
+#
+# every size is a synthetic dataset (utils/synthetic.py) written to a temp directory and
+# loaded through the same ingest path as the dashboard, with distinct texts growing with the
+# row count so search and raw data timings see real text cardinality; --data times a given
+# csv at its own size instead
+#
+# usage (from the repo root):
+#   python benchmarks/compute_suite.py                       # compare with benchmarks/baseline.json
+#   python benchmarks/compute_suite.py --save-baseline       # record a new baseline
+#   python benchmarks/compute_suite.py --sizes 50000 1000000 10000000 --fail-on-regression
+#   python benchmarks/compute_suite.py --data data/aug_nov_50k_calls_all_data_v2.csv
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+os.chdir(REPO_ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from utils.ingest import load_narrow_columns, load_text_columns  # noqa: E402
+from utils.synthetic import write_csv  # noqa: E402
+from utils.filter_index import FilterIndex  # noqa: E402
+from utils.cube import MetricsCube  # noqa: E402
+from utils.metrics import grouping_sets  # noqa: E402
+from utils.alignment import AlignmentEngine, alignment_by_confidence, ranked_distribution  # noqa: E402
+from utils.search_index import SearchIndex  # noqa: E402
+from utils.selection import RowSelection  # noqa: E402
+from utils.risk import score_risk, sweep_tiers, weight_simplex, boundary_grid  # noqa: E402
+from utils.compute import (  # noqa: E402
+    summary_table, outcome_shares, within_label_shares, breakdown_rows,
+    reference_label_totals, reference_mix_table, confidence_distribution,
+    filter_rows, row_order, page_rows,
+)
+from views.raw_data import RAW_COLUMNS  # noqa: E402
+
+BASELINE_PATH = "benchmarks/baseline.json"
+# the text columns of 10M rows with distinct texts alone take several GB, so that size is
+# opt in with --sizes
+SIZES = [50_000, 1_000_000]
+
+# dashboard defaults for the risk weights and tier boundaries, and the sweep grid at 5% steps
+RISK_WEIGHTS = {"repeat_rate_7d": 33, "churn_rate_30d": 33, "avg_outcome_cost": 34}
+RISK_BOUNDARIES = (0.33, 0.66)
+SWEEP_STEPS = 20
+
+
+# narrow and text frames of a seeded synthetic dataset of the given size
+def synthetic_frames(size, distinct_texts, seed=0):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / f"synthetic_{size}.csv"
+        write_csv(path, size, seed=seed, distinct_texts=distinct_texts)
+        return load_narrow_columns(path), load_text_columns(path)
+
+
+# best and median seconds over repeats (index builds run once, they are slow at scale)
+def timed(func, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return result, {"best": min(times), "median": float(np.median(times))}
+
+
+def run_size(df, text, repeats):
+    results = {}
+
+    def bench(name, func, n=repeats):
+        result, results[name] = timed(func, n)
+        print(f"  {name:<42} {results[name]['best'] * 1000:>10.2f} ms")
+        return result
+
+    ### indexes built once per dataset load ###
+    filter_index = bench("build.filter_index", lambda: FilterIndex(df), 1)
+    cube = bench("build.metrics_cube", lambda: MetricsCube(df), 1)
+    engine = bench("build.alignment_engine", lambda: AlignmentEngine(df), 1)
+    search_index = bench("build.search_index", lambda: SearchIndex(pd.concat([df, text], axis=1)), 1)
+
+    # unfiltered dashboard state
+    state = (
+        list(cube.label_names),
+        list(cube.outcome_names),
+        df["call_date"].min().date(),
+        df["call_date"].max().date(),
+    )
+
+    ### global filters ###
+    positions = bench("filters.resolve", lambda: filter_index.resolve(*state))
+    bench("filters.count", lambda: filter_index.count(*state))
+    metrics = bench("metrics.grouping_sets", lambda: grouping_sets(cube.select(*state)))
+
+    ### overview ###
+    bench("overview.summary_table", lambda: summary_table(metrics["label"], "label", len(df)))
+
+    ### outcome analysis ###
+    shares = bench("outcome.outcome_shares", lambda: outcome_shares(metrics["label_outcome"], len(df)))
+    bench("outcome.within_label_shares", lambda: within_label_shares(shares))
+    breakdown = bench("outcome.breakdown_rows", lambda: breakdown_rows(shares))
+    bench("outcome.score_risk", lambda: score_risk(breakdown, RISK_WEIGHTS, *RISK_BOUNDARIES))
+    bench("outcome.sweep_tiers", lambda: sweep_tiers(
+        breakdown, weight_simplex(SWEEP_STEPS), boundary_grid(SWEEP_STEPS)
+    ))
+
+    ### label evaluation ###
+    alignment = bench("label_eval.confusion", lambda: engine.confusion(positions))
+    for column, short in [("engineer_reported_symptom", "engineer"), ("first_csg_call_reason", "csg")]:
+        confusion = alignment[column]
+        bench(f"label_eval.ranked_distribution.{short}", lambda: ranked_distribution(confusion, column, 10))
+        bench(f"label_eval.alignment_by_confidence.{short}", lambda: alignment_by_confidence(confusion))
+        bench(f"label_eval.reference_label_totals.{short}", lambda: reference_label_totals(confusion))
+    bench("label_eval.reference_mix_table", lambda: reference_mix_table(alignment["engineer_reported_cause"]))
+    selection = RowSelection(df, positions)
+    bench("label_eval.confidence_distribution", lambda: confidence_distribution(
+        selection.take(["confidence"])["confidence"]
+    ))
+
+    ### raw data ###
+    bench("raw_data.filter_rows.search", lambda: filter_rows(selection, search_index, "red sync"))
+    bench("raw_data.filter_rows.flags", lambda: filter_rows(selection, search_index, "", "Yes", "No"))
+    order = bench("raw_data.row_order", lambda: row_order(selection, "outcome_cost"))
+    bench("raw_data.page_rows", lambda: page_rows(selection, text, order, 1, 100, RAW_COLUMNS))
+
+    return results
+
+
+# (size, function, baseline ms, current ms, ratio) for every timing slower than the baseline
+# by more than the threshold
+def regressions(baseline, current, threshold):
+    slower = []
+    for size, results in current.items():
+        for name, timing in results.items():
+            before = baseline.get(size, {}).get(name)
+            if before is None or before["best"] <= 0:
+                continue
+            ratio = timing["best"] / before["best"]
+            if ratio > 1 + threshold:
+                slower.append((size, name, before["best"] * 1000, timing["best"] * 1000, ratio))
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the headless compute functions at several dataset sizes")
+    parser.add_argument("--data", help="time this csv at its own size instead of synthetic datasets")
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument("--distinct-texts", type=float, default=1.0, help="distinct texts per row of the synthetic datasets")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="write the timings as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="slowdown flagged as a regression (0.25 = 25%%)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit with status 1 on any regression")
+    args = parser.parse_args()
+
+    pd.options.mode.copy_on_write = True
+    if args.data:
+        frames = [(load_narrow_columns(args.data), load_text_columns(args.data))]
+    else:
+        frames = (synthetic_frames(size, args.distinct_texts) for size in args.sizes)
+
+    current = {}
+    for df, text in frames:
+        print(f"{len(df):,} rows")
+        current[str(len(df))] = run_size(df, text, args.repeats)
+        del df, text
+
+    if args.save_baseline:
+        Path(args.baseline).write_text(json.dumps({
+            "machine": {
+                "platform": platform.platform(),
+                "processor": platform.processor() or platform.machine(),
+                "cpus": os.cpu_count(),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "pandas": pd.__version__,
+            },
+            "data": args.data or f"synthetic (distinct_texts={args.distinct_texts})",
+            "repeats": args.repeats,
+            "results": current,
+        }, indent=2) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return
+
+    if not Path(args.baseline).exists():
+        print(f"no baseline at {args.baseline}; run with --save-baseline to record one")
+        return
+
+    baseline = json.loads(Path(args.baseline).read_text())["results"]
+    slower = regressions(baseline, current, args.threshold)
+    if not slower:
+        print(f"no regressions over {args.threshold:.0%} against {args.baseline}")
+        return
+
+    print(f"{'rows':>10} {'function':<42} {'baseline ms':>12} {'now ms':>10} {'ratio':>6}")
+    for size, name, before, now, ratio in slower:
+        print(f"{int(size):>10,} {name:<42} {before:>12.2f} {now:>10.2f} {ratio:>6.2f}")
+
+    if args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+# rerun latency and process memory with many dashboard sessions open at once: each
+# simulated session clicks through views, sidebar filters and view widgets at random, and
+# the report gives p50 / p95 rerun latency per view plus peak resident memory
+#
+# sessions share the process-wide caches (dataset, indexes, cached aggregates) like real
+# sessions on one server, and every session's state stays alive for the whole run. AppTest
+# swaps a process-wide mock runtime around each run, so reruns cannot overlap in threads:
+# sessions take turns one rerun at a time (in a shuffled order each round), which measures
+# rerun cost and memory per session but not lock or GIL contention between reruns. AppTest
+# also always reruns the whole script, so widget changes inside fragments are timed as full
+# reruns (an upper bound on what the browser waits for)
+#
+# usage (from the repo root, with the dataset in data/):
+#   python benchmarks/load_test.py --sessions 10 --steps 30
+#   python benchmarks/load_test.py --data data/synthetic_1m.csv --sessions 25 --json results.json
+
+import argparse
+import datetime as dt
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+os.chdir(REPO_ROOT)
+
+# no background warm-up: it would fill the result cache behind the measured runs and
+# compete with them for the one interpreter
+os.environ["DASHBOARD_WARMUP"] = "0"
+
+import numpy as np  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from utils.memory import process_rss  # noqa: E402
+
+VIEWS = ["Background", "Overview", "Label Evaluation", "Outcome Analysis", "Raw Label Data"]
+
+# how often a session switches view, changes a sidebar filter or uses a widget in the view
+ACTION_WEIGHTS = {"view": 0.25, "filter": 0.25, "widget": 0.5}
+
+# raw data search terms
+SEARCH_TERMS = ["sync", "slow", "router", "engineer", "label:slow", "red light", ""]
+
+# sidebar filter keys
+FILTER_KEYS = ["selected_labels", "selected_outcomes", "start_date", "end_date"]
+
+# page titles of the views not titled by their own name
+VIEW_TITLES = {"Service Checker Call Label Modelling": "Background"}
+
+
+# view a finished run rendered, read from its page title
+def rendered_view(at):
+    title = at.title[0].value if len(at.title) else None
+    return VIEW_TITLES.get(title, title)
+
+
+class RssSampler:
+
+    # background thread polling the resident set size, so the peak of the load phase is
+    # known separately from the peak of dataset loading (ru_maxrss only gives the latter
+    # where /proc is unavailable)
+    def __init__(self, interval=0.02):
+        self.interval = interval
+        self.peak = process_rss()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, process_rss())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, process_rss())
+
+
+class Session:
+
+    # one simulated user: an AppTest with its own session state, driven by a seeded rng
+    def __init__(self, session_id, rng, views, timeout):
+        self.session_id = session_id
+        self.rng = rng
+        self.views = views
+        self.at = AppTest.from_file("app.py", default_timeout=timeout)
+        self.view = views[rng.integers(len(views))]
+        self.at.session_state["selected_view"] = self.view
+
+    def _choice(self, options):
+        return options[self.rng.integers(len(options))]
+
+    def switch_view(self):
+        self.view = self._choice([v for v in self.views if v != self.view] or self.views)
+        self.at.session_state["selected_view"] = self.view
+
+    # random label / outcome subset or date bound in the sidebar (False on views without filters)
+    def change_filter(self):
+        widgets = {w.key: w for w in list(self.at.sidebar.multiselect) + list(self.at.sidebar.date_input)}
+        keys = [k for k in FILTER_KEYS if k in widgets]
+        if not keys:
+            return False
+
+        widget = widgets[self._choice(keys)]
+        if widget.key in ("start_date", "end_date"):
+            days = (widget.max - widget.min).days
+            widget.set_value(widget.min + dt.timedelta(days=int(self.rng.integers(days + 1))))
+        else:
+            n = int(self.rng.integers(1, len(widget.options) + 1))
+            widget.set_value(list(self.rng.choice(widget.options, n, replace=False)))
+        return True
+
+    # AppTest sets option widgets by their displayed label, which only works when the
+    # widget's format_func leaves labels unchanged (not e.g. column name -> display name)
+    @staticmethod
+    def _settable(widget):
+        if not hasattr(widget, "options"):
+            return True
+        try:
+            return all(widget.format_func(option) == option for option in widget.options)
+        except Exception:
+            return False
+
+    # random new value for one enabled widget in the main area (False if there is none)
+    def use_widget(self):
+        main = self.at.main
+        candidates = [
+            w for w in (
+                list(main.slider) + list(main.select_slider) + list(main.selectbox) + list(main.radio)
+                + list(main.toggle) + list(main.number_input) + list(main.text_input)
+            )
+            if not w.disabled and not isinstance(w.value, (list, tuple)) and self._settable(w)
+        ]
+        if not candidates:
+            return False
+
+        widget = self._choice(candidates)
+        kind = type(widget).__name__
+        if kind == "Slider":
+            steps = int(round((widget.max - widget.min) / widget.step))
+            value = widget.min + int(self.rng.integers(steps + 1)) * widget.step
+            widget.set_value(round(value, 6) if isinstance(value, float) else value)
+        elif kind in ("SelectSlider", "Radio"):
+            widget.set_value(self._choice(widget.options))
+        elif kind == "Selectbox":
+            widget.select_index(int(self.rng.integers(len(widget.options))))
+        elif kind in ("Checkbox", "Toggle"):
+            widget.set_value(not widget.value)
+        elif kind == "NumberInput":
+            widget.set_value(int(self.rng.integers(widget.min, (widget.max or widget.min) + 1)))
+        else:
+            widget.input(self._choice(SEARCH_TERMS))
+        return True
+
+    # one timed rerun after a random action: (view, action, seconds, exception count)
+    def step(self, action=None):
+        if action is None:
+            action = self.rng.choice(list(ACTION_WEIGHTS), p=list(ACTION_WEIGHTS.values()))
+            if action == "filter" and not self.change_filter():
+                action = "view"
+            if action == "widget" and not self.use_widget():
+                action = "view"
+            if action == "view":
+                self.switch_view()
+
+        # the menu only keeps a view set through session state for one run, after which it
+        # falls back to its first option, so the view is set again before every run
+        self.at.session_state["selected_view"] = self.view
+
+        start = time.perf_counter()
+        self.at.run()
+        seconds = time.perf_counter() - start
+
+        # a rerun of another view would be timed under the wrong one (runs that raised are
+        # counted as errors instead)
+        if not self.at.exception and rendered_view(self.at) != self.view:
+            raise RuntimeError(f"session {self.session_id} rendered {rendered_view(self.at)} while timing {self.view}")
+        return {"session": self.session_id, "view": self.view, "action": str(action),
+                "seconds": seconds, "errors": len(self.at.exception)}
+
+
+# load the dataset and build every shared cache once, as the first user of a server would
+def warm_up(views, timeout):
+    at = AppTest.from_file("app.py", default_timeout=timeout)
+    for view in views:
+        at.session_state["selected_view"] = view
+        at.run()
+        if at.exception:
+            raise RuntimeError(f"{view} failed: {at.exception[0].value}")
+        if rendered_view(at) != view:
+            raise RuntimeError(f"{view} rendered {rendered_view(at)}")
+
+
+# count, p50, p95 and max latency in ms for each view (and all views together)
+def latency_table(records):
+    rows = {}
+    for view in sorted({r["view"] for r in records}) + ["all views"]:
+        seconds = np.array([r["seconds"] for r in records if view in (r["view"], "all views")]) * 1000
+        rows[view] = {
+            "reruns": int(len(seconds)),
+            "p50_ms": float(np.percentile(seconds, 50)),
+            "p95_ms": float(np.percentile(seconds, 95)),
+            "max_ms": float(seconds.max()),
+        }
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent dashboard sessions and report rerun latency and memory")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--steps", type=int, default=20, help="interactions per session")
+    parser.add_argument("--data", default=None, help="csv to run on (defaults to the dashboard's own DATA_PATH)")
+    parser.add_argument("--views", nargs="+", default=VIEWS, choices=VIEWS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--json", default=None, help="also write the results to this json file")
+    args = parser.parse_args()
+
+    if args.data:
+        os.environ["DASHBOARD_DATA_PATH"] = args.data
+
+    rss_start = process_rss()
+    start = time.perf_counter()
+    warm_up(args.views, args.timeout)
+    warm_up_seconds = time.perf_counter() - start
+    rss_warm = process_rss()
+
+    seeds = np.random.SeedSequence(args.seed).spawn(args.sessions + 1)
+    order_rng = np.random.default_rng(seeds[0])
+
+    records = []
+    with RssSampler() as rss:
+        sessions = [
+            Session(i, np.random.default_rng(seed), args.views, args.timeout) for i, seed in enumerate(seeds[1:])
+        ]
+
+        # every session opens the dashboard, then they take turns interacting
+        opened = [session.step(action="open") for session in sessions]
+        start = time.perf_counter()
+        for _ in range(args.steps):
+            for i in order_rng.permutation(len(sessions)):
+                records.append(sessions[i].step())
+        load_seconds = time.perf_counter() - start
+
+    latency = latency_table(records)
+    errors = sum(r["errors"] for r in opened + records)
+
+    print(f"{args.sessions} sessions x {args.steps} interactions, warm-up {warm_up_seconds:,.1f} s")
+    print(f"\n{'view':<20} {'reruns':>7} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for view, row in latency.items():
+        print(f"{view:<20} {row['reruns']:>7} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['max_ms']:>9.1f}")
+    open_ms = np.array([r["seconds"] for r in opened]) * 1000
+    print(f"{'(session open)':<20} {len(open_ms):>7} {np.percentile(open_ms, 50):>9.1f} "
+          f"{np.percentile(open_ms, 95):>9.1f} {open_ms.max():>9.1f}")
+
+    print(f"\nRSS before load      {rss_start / 1e6:>9,.0f} MB")
+    print(f"RSS after warm-up    {rss_warm / 1e6:>9,.0f} MB")
+    print(f"peak RSS             {rss.peak / 1e6:>9,.0f} MB")
+    print(f"per session          {(rss.peak - rss_warm) / args.sessions / 1e6:>9,.1f} MB above warm-up")
+    print(f"throughput           {len(records) / load_seconds:>9,.1f} reruns/s")
+    actions = {a: sum(r["action"] == a for r in records) for a in ACTION_WEIGHTS}
+    print(f"interactions         {', '.join(f'{n} {a}' for a, n in actions.items())}")
+    print(f"reruns with errors   {errors:>9}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "sessions": args.sessions,
+            "steps": args.steps,
+            "data": os.environ.get("DASHBOARD_DATA_PATH"),
+            "seed": args.seed,
+            "latency": latency,
+            "rss_mb": {
+                "start": rss_start / 1e6,
+                "warm": rss_warm / 1e6,
+                "peak": rss.peak / 1e6,
+                "per_session": (rss.peak - rss_warm) / args.sessions / 1e6,
+            },
+            "errors": errors,
+        }, indent=2) + "\n")
+
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# peak python heap allocated by one warm rerun of each dashboard view
+#
+# usage (from the repo root, with the dataset in data/):
+#   python benchmarks/rerun_memory.py
+#   python benchmarks/rerun_memory.py --views Overview "Raw Label Data" --reruns 5
+
+import argparse
+import os
+import sys
+import tracemalloc
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+os.chdir(REPO_ROOT)
+
+# no background warm-up: it would fill the result cache behind the measured runs and
+# compete with them for the one interpreter
+os.environ["DASHBOARD_WARMUP"] = "0"
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+VIEWS = ["Background", "Overview", "Label Evaluation", "Outcome Analysis", "Raw Label Data"]
+
+
+def measure_view(view, reruns):
+    at = AppTest.from_file("app.py", default_timeout=600)
+    at.session_state["selected_view"] = view
+
+    # first run loads and caches the dataset, indexes and cubes
+    at.run()
+    if at.exception:
+        raise RuntimeError(f"{view} failed: {at.exception[0].value}")
+
+    peaks = []
+    for _ in range(reruns):
+        tracemalloc.start()
+        at.run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peaks.append(peak)
+
+    return max(peaks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory allocated by one warm rerun of each view")
+    parser.add_argument("--views", nargs="+", default=VIEWS, choices=VIEWS)
+    parser.add_argument("--reruns", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'view':<20} {'peak MB per rerun':>18}")
+    for view in args.views:
+        peak = measure_view(view, args.reruns)
+        print(f"{view:<20} {peak / 1e6:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# shared fixtures: a small synthetic dataset in the dashboard's csv layout (utils/synthetic.py),
+# written once per test run to a temp directory, never to data/, and its frames loaded through
+# the same ingest path as the dashboard
+
+import datetime as dt
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from utils.ingest import load_narrow_columns, load_text_columns  # noqa: E402
+from utils.synthetic import write_csv  # noqa: E402
+
+ROWS = 20_000
+
+
+@pytest.fixture(scope="session")
+def dataset_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("data") / "synthetic_calls.csv"
+    write_csv(path, ROWS, chunk_size=ROWS)
+    return path
+
+
+@pytest.fixture(scope="session")
+def df_label(dataset_path):
+    return load_narrow_columns(dataset_path)
+
+
+@pytest.fixture(scope="session")
+def text_data(dataset_path):
+    return load_text_columns(dataset_path)
+
+
+# filter states as (labels, outcomes, start date, end date) built from the dataset's own
+# categories and date range: the defaults, narrowed ones and the edge cases of each axis
+@pytest.fixture(scope="session")
+def filter_states(df_label):
+    labels = list(df_label["label"].cat.categories)
+    outcomes = list(df_label["selected_outcome_cleaned"].cat.categories)
+    start, end = df_label["call_date"].min().date(), df_label["call_date"].max().date()
+    day = dt.timedelta(days=1)
+    return {
+        "all": (labels, outcomes, start, end),
+        "narrowed": (labels[:2], outcomes[1:3], start + 10 * day, end - 30 * day),
+        "one day": (labels, outcomes, start + 5 * day, start + 5 * day),
+        "last day, one label": (labels[-1:], outcomes, end, end),
+        "wider than data": (labels, outcomes, start - 30 * day, end + 30 * day),
+        "before data": (labels, outcomes, start - 400 * day, start - day),
+        "reversed dates": (labels, outcomes, end, start),
+        "no labels": ([], outcomes, start, end),
+        "no outcomes": (labels, [], start, end),
+        "unknown values": (["Not a label"] + labels[:1], ["Not an outcome"] + outcomes, start, end),
+    }
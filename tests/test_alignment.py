@@ -0,0 +1,112 @@
+# engine tests for label evaluation: AlignmentEngine confusion counts and the tables built
+# from them against the per-reference pandas filters and groupbys the view ran before them
+#
+# usage (from the repo root):
+#   python -m pytest -q tests
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.alignment import (
+    REFERENCES, THRESHOLDS, AlignmentEngine, alignment_by_confidence, confusion_table, ranked_distribution,
+)
+from utils.filter_index import FilterIndex
+
+MAPPED_REFERENCES = [column for column, config in REFERENCES.items() if config["mapping"]]
+
+
+@pytest.fixture(scope="module")
+def engine(df_label):
+    return AlignmentEngine(df_label)
+
+
+# (filtered frame, confusion counts) for the default and a narrowed filter state
+@pytest.fixture(scope="module", params=["all", "narrowed"])
+def filtered(request, df_label, engine, filter_states):
+    positions = FilterIndex(df_label).resolve(*filter_states[request.param])
+    return df_label.iloc[positions], engine.confusion(positions)
+
+
+@pytest.mark.parametrize("reference", list(REFERENCES))
+def test_confusion_table_matches_crosstab(filtered, reference):
+    df, confusion = filtered
+    expected = pd.crosstab(df["label"], df[reference]).reindex(
+        index=confusion[reference].label_names, columns=confusion[reference].reference_names, fill_value=0
+    )
+
+    np.testing.assert_array_equal(confusion_table(confusion[reference]).to_numpy(), expected.to_numpy())
+
+
+# the view's alignment section at every confidence slider position
+@pytest.mark.parametrize("reference", MAPPED_REFERENCES)
+def test_alignment_by_confidence_matches_pandas(filtered, reference):
+    df, confusion = filtered
+    mapping = REFERENCES[reference]["mapping"]
+    table = alignment_by_confidence(confusion[reference])
+
+    for threshold in THRESHOLDS:
+        base = df[df[reference].notna() & (df["confidence"] >= threshold)]
+        mapped = base.assign(mapped=base[reference].astype(object).map(mapping)).dropna(subset=["mapped"])
+        expected = (
+            mapped.assign(match=(mapped["label"].astype(object) == mapped["mapped"]).astype(int))
+            .groupby("label", observed=True)
+            .agg(mapped_count=("mapped", "size"), match_count=("match", "sum"))
+            .join(base.groupby("label", observed=True).size().rename("label_reason_count"))
+            .reset_index()
+        )
+        expected["alignment_pct"] = expected["match_count"] / expected["label_reason_count"] * 100
+
+        result = table["label"][table["label"]["min_confidence"] == threshold]
+        pd.testing.assert_frame_equal(
+            result[list(expected.columns)].astype({"label": str}).reset_index(drop=True),
+            expected.astype({"label": str}),
+            check_dtype=False
+        )
+
+        total = table["total"].set_index("min_confidence").loc[threshold]
+        assert total["calls"] == len(base)
+        assert total["match_count"] == expected["match_count"].sum()
+
+
+# the view's top x reference values per label, with and without the "everything else" bucket
+@pytest.mark.parametrize("top_x", [1, 5, 100])
+def test_ranked_distribution_matches_pandas(filtered, top_x):
+    df, confusion = filtered
+    reference = "engineer_reported_symptom"
+    with_reason = df[df[reference].notna()]
+
+    counts = with_reason.groupby(["label", reference], observed=True).size().reset_index(name="count")
+    totals = with_reason.groupby("label", observed=True).size().rename("total_calls")
+    # ties keep category order, as the engine's stable ranking does
+    top = counts.groupby(reference, observed=True)["count"].sum().sort_values(ascending=False, kind="stable").head(top_x)
+
+    expected = counts[counts[reference].isin(top.index)].join(totals, on="label")
+    expected["pct_of_label"] = expected["count"] / expected["total_calls"] * 100
+    result = ranked_distribution(confusion[reference], reference, top_x)
+
+    keys = ["label", reference]
+    pd.testing.assert_frame_equal(
+        result[list(expected.columns)].astype({k: str for k in keys}).sort_values(keys).reset_index(drop=True),
+        expected.astype({k: str for k in keys}).sort_values(keys).reset_index(drop=True),
+        check_dtype=False
+    )
+
+    bucket = ranked_distribution(confusion[reference], reference, top_x, other_bucket="Everything else")
+    everything_else = bucket[bucket[reference] == "Everything else"].set_index("label")["count"]
+    expected_else = (totals - expected.groupby("label", observed=True)["count"].sum().reindex(totals.index, fill_value=0))
+    pd.testing.assert_series_equal(
+        everything_else.rename(None), expected_else[expected_else > 0].rename(None),
+        check_index_type=False, check_dtype=False, check_categorical=False
+    )
+
+
+# without the source's content hash, any change to a row's filter or reference values changes
+# the cache keys
+def test_engine_fingerprint_covers_rows(df_label):
+    changed = df_label.copy()
+    changed.loc[0, "confidence"] = 1.0 if df_label["confidence"].iloc[0] != 1.0 else 2.0
+
+    assert AlignmentEngine(df_label).fingerprint == AlignmentEngine(df_label.copy()).fingerprint
+    assert AlignmentEngine(changed).fingerprint != AlignmentEngine(df_label).fingerprint
+    assert AlignmentEngine(df_label, fingerprint="a").fingerprint != AlignmentEngine(df_label, fingerprint="b").fingerprint
@@ -0,0 +1,108 @@
+# engine tests for the global filters: FilterIndex and the MetricsCube grouping sets against
+# the pandas boolean filter and groupby aggregation the views ran before them, for every
+# filter state in conftest.py
+#
+# usage (from the repo root):
+#   python -m pytest -q tests
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.filter_index import FilterIndex
+from utils.cube import MetricsCube
+from utils.metrics import grouping_sets
+
+STATE_NAMES = [
+    "all", "narrowed", "one day", "last day, one label", "wider than data",
+    "before data", "reversed dates", "no labels", "no outcomes", "unknown values",
+]
+
+# the outcome analysis aggregation before the cube
+AGGREGATIONS = {
+    "volume": ("selected_outcome_cleaned", "size"),
+    "repeat_rate_7d": ("sc_call_next_7d_flag", "mean"),
+    "churn_rate_30d": ("bb_churn_next_30d", "mean"),
+    "churn_rate_60d": ("bb_churn_next_60d", "mean"),
+    "avg_outcome_cost": ("outcome_cost", "mean"),
+    "total_outcome_cost": ("outcome_cost", "sum"),
+}
+
+
+# the app's filter before FilterIndex
+def baseline_mask(df, labels, outcomes, start_date, end_date):
+    return (
+        df["label"].isin(labels)
+        & df["selected_outcome_cleaned"].isin(outcomes)
+        & df["call_date"].dt.date.between(start_date, end_date)
+    ).to_numpy()
+
+
+def baseline_aggregates(df, keys):
+    return df.groupby(keys, observed=True).agg(**AGGREGATIONS).reset_index()
+
+
+# tables equal up to row order, key dtypes and float32 rounding of the source columns
+def assert_same_table(result, expected, keys):
+    result = result.astype({key: str for key in keys}).sort_values(keys).reset_index(drop=True)
+    expected = expected.astype({key: str for key in keys}).sort_values(keys).reset_index(drop=True)
+    pd.testing.assert_frame_equal(result[list(expected.columns)], expected, check_dtype=False, rtol=1e-5)
+
+
+@pytest.fixture(scope="module")
+def filter_index(df_label):
+    return FilterIndex(df_label)
+
+
+@pytest.fixture(scope="module")
+def cube(df_label):
+    return MetricsCube(df_label)
+
+
+@pytest.mark.parametrize("state", STATE_NAMES)
+def test_filter_index_matches_pandas(df_label, filter_index, filter_states, state):
+    expected = baseline_mask(df_label, *filter_states[state])
+
+    assert filter_index.count(*filter_states[state]) == expected.sum()
+    np.testing.assert_array_equal(filter_index.resolve(*filter_states[state]), np.flatnonzero(expected))
+
+
+# rows without a label or outcome never match, like isin on a missing value
+def test_filter_index_skips_missing_values(df_label, filter_states):
+    df = df_label.assign(
+        label=df_label["label"].mask(np.arange(len(df_label)) % 7 == 0),
+        selected_outcome_cleaned=df_label["selected_outcome_cleaned"].mask(np.arange(len(df_label)) % 11 == 0),
+    )
+    expected = baseline_mask(df, *filter_states["all"])
+
+    np.testing.assert_array_equal(FilterIndex(df).resolve(*filter_states["all"]), np.flatnonzero(expected))
+
+
+@pytest.mark.parametrize("state", STATE_NAMES)
+def test_grouping_sets_match_pandas(df_label, cube, filter_states, state):
+    df = df_label[baseline_mask(df_label, *filter_states[state])]
+    metrics = grouping_sets(cube.select(*filter_states[state]))
+
+    assert_same_table(metrics["label"], baseline_aggregates(df, ["label"]), ["label"])
+    assert_same_table(
+        metrics["outcome"], baseline_aggregates(df, ["selected_outcome_cleaned"]), ["selected_outcome_cleaned"]
+    )
+    keys = ["label", "selected_outcome_cleaned"]
+    assert_same_table(metrics["label_outcome"], baseline_aggregates(df, keys), keys)
+
+    # one overall row even when nothing matches
+    overall = metrics["overall"]
+    assert len(overall) == 1 and overall["volume"].iloc[0] == len(df)
+    if len(df):
+        expected = df.assign(overall=0).groupby("overall").agg(**AGGREGATIONS).reset_index(drop=True)
+        pd.testing.assert_frame_equal(overall[list(expected.columns)], expected, check_dtype=False, rtol=1e-5)
+
+
+# two datasets with the same totals but calls on different days must not share cached results
+def test_cube_fingerprint_covers_every_day(df_label):
+    first = df_label["call_date"].iloc[0]
+    moved = df_label.copy()
+    moved.loc[0, "call_date"] = first + pd.Timedelta(days=-1 if first == df_label["call_date"].max() else 1)
+
+    assert MetricsCube(df_label).fingerprint == MetricsCube(df_label.copy()).fingerprint
+    assert MetricsCube(moved).fingerprint != MetricsCube(df_label).fingerprint
@@ -0,0 +1,33 @@
+# app tests for the outcome analysis view, run on the synthetic dataset (see conftest.py)
+#
+# usage (from the repo root):
+#   python -m pytest -q tests
+
+from pathlib import Path
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def app(dataset_path, monkeypatch):
+    monkeypatch.setenv("DASHBOARD_DATA_PATH", str(dataset_path))
+    monkeypatch.chdir(REPO_ROOT)
+
+    at = AppTest.from_file(str(REPO_ROOT / "app.py"), default_timeout=600)
+    at.session_state["selected_view"] = "Outcome Analysis"
+    at.run()
+    assert not at.exception
+    return at
+
+
+# the sensitivity sweep is off by default, so only a run with the toggle on renders it
+def test_tier_sweep_runs(app):
+    app.toggle(key="sweep_enabled").set_value(True)
+    app.session_state["selected_view"] = "Outcome Analysis"
+    app.run()
+
+    assert not app.exception, app.exception[0].value
+    assert any("weight and boundary configurations evaluated" in caption.value for caption in app.caption)
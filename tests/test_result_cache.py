@@ -0,0 +1,152 @@
+# engine tests for the shared result cache and its disk store: lru order, byte and ttl
+# limits, one computation per key across threads, and the persisted tables' round trip,
+# eviction and clean up
+#
+# usage (from the repo root):
+#   python -m pytest -q tests
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.memory import deep_size
+from utils.result_cache import ResultCache
+from utils.result_store import ResultStore
+
+
+def frame(n=1_000, seed=0):
+    return pd.DataFrame({"value": np.random.default_rng(seed).random(n)})
+
+
+# clock the ttl tests move by hand
+class Clock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def store(tmp_path):
+    csv_path = tmp_path / "calls.csv"
+    csv_path.write_text("label\nSlow Wi-Fi\n")
+    return ResultStore(csv_path)
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None and cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_byte_and_ttl_limits():
+    value = frame()
+    clock = Clock()
+    cache = ResultCache(max_bytes=int(deep_size(value) * 1.5), ttl=10, clock=clock)
+
+    cache.put("a", value)
+    cache.put("b", value)
+    assert len(cache) == 1 and cache.get("b") is value
+
+    # results larger than the whole budget are never stored
+    cache.put("big", frame(10_000))
+    assert cache.get("big") is None
+
+    clock.now = 11
+    assert cache.get("b") is None and cache.stats()["expirations"] == 1
+
+
+def test_cache_computes_once_across_threads():
+    cache = ResultCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return frame()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute(("ns", "k"), compute))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+# only persisted results reach the store, and they come back from it without recomputing
+def test_cache_persists_opted_in_results(store):
+    cache = ResultCache()
+    cache.attach_store(store)
+    cache.get_or_compute(("slider", "k"), frame)
+    cache.get_or_compute(("base", "k"), frame, persist=True)
+
+    assert len(store) == 1 and store.load("slider", "k") is None
+
+    cache.clear()
+    reloaded = cache.get_or_compute(("base", "k"), lambda: pytest.fail("recomputed a stored result"), persist=True)
+    pd.testing.assert_frame_equal(reloaded, frame())
+
+
+def test_store_round_trip(store):
+    tables = {"label": frame(seed=1), "total": frame(seed=2)}
+    store.save("ns", "frame", frame())
+    store.save("ns", "tables", tables)
+    store.save("ns", "number", 42)
+
+    pd.testing.assert_frame_equal(store.load("ns", "frame"), frame())
+    loaded = store.load("ns", "tables")
+    assert list(loaded) == list(tables)
+    for name in tables:
+        pd.testing.assert_frame_equal(loaded[name], tables[name])
+    assert store.load("ns", "number") is None
+    assert store.stats()["entries"] == 2
+
+
+# least recently used results go first, in the same order after the store is reopened
+def test_store_evicts_least_recently_used(store, tmp_path):
+    for key in ["a", "b", "c"]:
+        store.save("ns", key, frame())
+        time.sleep(0.01)
+    entry_bytes = store.nbytes // 3
+    store.load("ns", "a")
+
+    store.max_bytes = entry_bytes * 3 + entry_bytes // 2
+    store.save("ns", "d", frame())
+    assert [store.load("ns", key) is not None for key in "abcd"] == [True, False, True, True]
+
+    reopened = ResultStore(tmp_path / "calls.csv", max_bytes=entry_bytes * 2 + entry_bytes // 2)
+    assert len(reopened) == 3 and reopened.nbytes == store.nbytes
+    reopened.save("ns", "e", frame())
+    assert sorted(path.name for path in (reopened.root / "ns").iterdir()) == ["d", "e"]
+
+
+# a table that fails to write stays out of the store and leaves no temp directory behind
+def test_store_cleans_up_failed_writes(store):
+    store.save("ns", "bad", pd.DataFrame({"value": [object(), object()]}))
+
+    assert store.load("ns", "bad") is None
+    assert list((store.root / "ns").iterdir()) == []
+    assert len(store) == 0 and store.nbytes == 0
+
+
+# a changed source csv starts a new directory and drops the old one
+def test_store_drops_results_of_old_content(store, tmp_path):
+    store.save("ns", "k", frame())
+    (tmp_path / "calls.csv").write_text("label\nOther\n")
+    changed = ResultStore(tmp_path / "calls.csv")
+
+    assert changed.root != store.root and not store.root.exists()
+    assert changed.load("ns", "k") is None
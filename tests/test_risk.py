@@ -0,0 +1,83 @@
+# engine tests for outcome risk tiering: score_risk against the view's percentile rank,
+# weighted sum and pd.cut tiers, and sweep_tiers against scoring every weight and boundary
+# configuration one at a time
+#
+# usage (from the repo root):
+#   python -m pytest -q tests
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.cube import MetricsCube
+from utils.metrics import grouping_sets
+from utils.risk import RISK_KPIS, TIERS, boundary_grid, normalise_weights, score_risk, sweep_tiers, weight_simplex
+
+
+# numeric label x outcome breakdown rows of the unfiltered dataset
+@pytest.fixture(scope="module")
+def breakdown(df_label, filter_states):
+    return grouping_sets(MetricsCube(df_label).select(*filter_states["all"]))["label_outcome"]
+
+
+# percentile scores and weighted risk scores as the view computed them
+def baseline_scores(table, weights, by=None):
+    ranked = table[RISK_KPIS] if by is None else table.groupby(by, observed=True)[RISK_KPIS]
+    scores = ranked.rank(pct=True)
+    weight_sum = sum(weights) or 1
+    return scores, sum(scores[kpi] * weight / weight_sum for kpi, weight in zip(RISK_KPIS, weights))
+
+
+# tiers with pd.cut's right-closed bins: Low up to the low boundary, High above the high one
+def baseline_tiers(risk_scores, low, high):
+    tiers = np.select([risk_scores <= low, risk_scores <= high], [0, 1], 2)
+    return np.where(np.isnan(risk_scores), -1, tiers)
+
+
+@pytest.mark.parametrize("weights", [(33, 33, 34), (100, 0, 0), (10, 60, 30), (0, 0, 0)])
+@pytest.mark.parametrize("boundaries", [(0.33, 0.66), (0.2, 0.8), (0.0, 1.0)])
+@pytest.mark.parametrize("by", [None, "label"])
+def test_score_risk_matches_pandas(breakdown, weights, boundaries, by):
+    scores, risk_scores = baseline_scores(breakdown, weights, by)
+    expected_tiers = pd.cut(
+        risk_scores, bins=[-0.01, boundaries[0], boundaries[1], 1.01], labels=TIERS
+    )
+
+    result = score_risk(breakdown, dict(zip(RISK_KPIS, weights)), *boundaries, by=by)
+
+    for kpi in RISK_KPIS:
+        np.testing.assert_allclose(result[f"{kpi}_score"], scores[kpi])
+    np.testing.assert_allclose(result["risk_score"], risk_scores)
+    np.testing.assert_array_equal(result["risk_tier"].astype(object), expected_tiers.astype(object))
+    # the engine sums the weighted scores in another order, which can tip a rounding
+    np.testing.assert_allclose(result["risk_pct"], (risk_scores * 100).round(1), atol=0.1 + 1e-9)
+
+
+# shares of every configuration's tier, one weight combination and boundary pair at a time;
+# scores are weighted in one product like the engine's, as grid scores often land exactly on
+# a grid boundary, where summation order alone would change the tier
+def baseline_sweep(table, weight_grid, boundaries, by=None):
+    scores, _ = baseline_scores(table, [1, 1, 1], by)
+    risk_scores = scores.to_numpy() @ normalise_weights(weight_grid).T
+    counts = np.zeros((len(table), len(TIERS)))
+    for config in range(len(weight_grid)):
+        for low, high in boundaries:
+            tiers = baseline_tiers(risk_scores[:, config], low, high)
+            counts[np.arange(len(table))[tiers >= 0], tiers[tiers >= 0]] += 1
+    return counts / (len(weight_grid) * len(boundaries))
+
+
+@pytest.mark.parametrize("by", [None, "label"])
+def test_sweep_tiers_matches_pandas(breakdown, by):
+    weight_grid, boundaries = weight_simplex(5), boundary_grid(5)
+    expected = baseline_sweep(breakdown, weight_grid, boundaries, by)
+
+    result = sweep_tiers(breakdown, weight_grid, boundaries, by=by)
+    shares = result[[f"{tier.lower()}_share" for tier in TIERS]].to_numpy()
+
+    scored = ~np.isnan(shares).any(axis=1)
+    np.testing.assert_allclose(shares[scored], expected[scored])
+    np.testing.assert_array_equal(
+        result["modal_tier"].cat.codes.to_numpy()[scored], expected[scored].argmax(axis=1)
+    )
+    assert (result["n_configs"] == len(weight_grid) * len(boundaries)).all()
@@ -0,0 +1,64 @@
+# engine tests for the raw data search: SearchIndex against case-insensitive substring
+# matching of the searchable columns with pandas, as the view did before the index
+#
+# usage (from the repo root):
+#   python -m pytest -q tests
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.search_index import SEARCH_FIELDS, FieldIndex, SearchIndex
+
+
+@pytest.fixture(scope="module")
+def searchable(df_label, text_data):
+    return pd.concat([df_label, text_data], axis=1)
+
+
+@pytest.fixture(scope="module")
+def index(searchable):
+    return SearchIndex(searchable)
+
+
+# rows where any of the columns contains the term
+def baseline_rows(df, columns, term):
+    mask = np.zeros(len(df), dtype=bool)
+    for column in columns:
+        mask |= df[column].astype(object).str.contains(term, case=False, regex=False, na=False).to_numpy(dtype=bool)
+    return mask
+
+
+# (query, [(columns, term) that must all match]); unscoped terms search every field
+QUERIES = [
+    ("buffering", [(list(SEARCH_FIELDS), "buffering")]),
+    ("BUFFER", [(list(SEARCH_FIELDS), "buffer")]),
+    ("uffe", [(list(SEARCH_FIELDS), "uffe")]),
+    ("wi-fi", [(list(SEARCH_FIELDS), "wi-fi")]),
+    ("speed.", [(list(SEARCH_FIELDS), "speed.")]),
+    ('"slow speed"', [(list(SEARCH_FIELDS), "slow speed")]),
+    ("router speed", [(list(SEARCH_FIELDS), "router"), (list(SEARCH_FIELDS), "speed")]),
+    ("evidence:router", [(["evidence"], "router")]),
+    ("label:slow reason:app", [(["label"], "slow"), (["long_reason"], "app")]),
+    ("outcome:visit", [(["selected_outcome_cleaned"], "visit")]),
+    ("nosuchword", [(list(SEARCH_FIELDS), "nosuchword")]),
+]
+
+
+@pytest.mark.parametrize("query, terms", QUERIES, ids=[query for query, _ in QUERIES])
+def test_search_matches_pandas(searchable, index, query, terms):
+    expected = np.ones(len(searchable), dtype=bool)
+    for columns, term in terms:
+        expected &= baseline_rows(searchable, columns, term)
+
+    np.testing.assert_array_equal(index.search(query), np.flatnonzero(expected))
+
+
+# building the token postings in chunks gives the same index as one pass
+def test_field_index_chunks(text_data):
+    whole = FieldIndex(text_data["evidence"], chunk_size=len(text_data))
+    chunked = FieldIndex(text_data["evidence"], chunk_size=777)
+
+    pd.testing.assert_series_equal(whole.vocab, chunked.vocab)
+    np.testing.assert_array_equal(whole.token_values, chunked.token_values)
+    np.testing.assert_array_equal(whole.token_ptr, chunked.token_ptr)
@@ -0,0 +1,254 @@
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+from utils.metrics import filter_state_key
+from utils.result_cache import cached_result
+
+# minimum confidence thresholds offered by the alignment sliders (confidence is scored 1-10)
+THRESHOLDS = np.arange(1, 11)
+
+# confidence slots per row: bins 0-10 plus a last slot for rows without a score
+N_SLOTS = THRESHOLDS[-1] + 2
+
+# label column the reference columns are compared against
+LABEL = "label"
+
+# reference columns the llm label is evaluated against, each with the reference value ->
+# label mapping that counts as agreement; references without an agreed mapping still get
+# a full confusion matrix, just no alignment score
+REFERENCES = {
+    "engineer_reported_symptom": {
+        "name": "Engineer Reported Reason",
+        "short_name": "Engineer Reason",
+        "mapping": {
+            "TT Broadband - No Sync": "Wi-Fi Status",
+            "TT Broadband -  Connection Dropping out": "Unreliable Wi-Fi",  # has extra space
+            "TT Broadband - Slow Speed": "Slow Wi-Fi",
+        },
+    },
+    "engineer_reported_cause": {
+        "name": "Engineer Reported Cause",
+        "short_name": "Engineer Cause",
+        "mapping": {},
+    },
+    "engineer_reported_action": {
+        "name": "Engineer Reported Action",
+        "short_name": "Engineer Action",
+        "mapping": {},
+    },
+    "first_csg_call_reason": {
+        "name": "CSG Call Reason",
+        "short_name": "CSG Reason",
+        "mapping": {
+            "No Connection": "Wi-Fi Status",
+            "Intermittent Connection": "Unreliable Wi-Fi",
+            "Slow Connection": "Slow Wi-Fi",
+        },
+    },
+}
+
+
+# per-row confidence bin (0-10) where a row passes threshold t exactly when bin >= t;
+# rows without a confidence score get no bin (-1) and never pass
+def confidence_bins(confidence):
+    confidence = np.asarray(confidence, dtype=np.float64)
+    bins = np.floor(np.clip(confidence, 0, THRESHOLDS[-1]))
+    return np.where(np.isnan(bins), -1, bins).astype(np.int64)
+
+
+# counts at or above every threshold: reverse cumulative sum over the last (bin) axis
+def at_or_above(counts):
+    return np.flip(np.cumsum(np.flip(counts, axis=-1), axis=-1), axis=-1)[..., THRESHOLDS]
+
+
+class AlignmentEngine:
+
+    # built once per dataset load: label, confidence and reference values as integer codes,
+    # so the confusion matrices for every configured reference come from one bincount over
+    # the selected rows, whatever the number of references
+    def __init__(self, df, references=REFERENCES, fingerprint=None):
+        labels = df[LABEL].cat
+        self.label_names = np.array(labels.categories, dtype=object)
+        self.references = references
+
+        # (label slot, confidence slot) per row; label slot 0 holds rows without a label
+        label_slots = labels.codes.to_numpy().astype(np.int64) + 1
+        bins = confidence_bins(df["confidence"].to_numpy(dtype=np.float64, na_value=np.nan))
+        self.row_cells = label_slots * N_SLOTS + np.where(bins < 0, N_SLOTS - 1, bins)
+        self.row_size = (len(self.label_names) + 1) * N_SLOTS
+
+        # reference slots per row (slot 0 = missing reference) and where each reference's
+        # block of cells starts in the shared bincount
+        label_ids = {label: i for i, label in enumerate(self.label_names)}
+        self.reference_names = {}
+        self.reference_slots = {}
+        self.lookups = {}
+        self.offsets = {}
+
+        offset = 0
+        for column, config in references.items():
+            values = df[column].cat
+            self.reference_names[column] = np.array(values.categories, dtype=object)
+            self.reference_slots[column] = values.codes.to_numpy().astype(np.int64) + 1
+
+            # reference values mapped to label codes through the categories, not per row
+            # (-1 = unmapped)
+            self.lookups[column] = np.array(
+                [-1] + [label_ids.get(config["mapping"].get(x), -1) for x in values.categories],
+                dtype=np.int64
+            )
+
+            self.offsets[column] = offset
+            offset += (len(values.categories) + 1) * self.row_size
+
+        self.size = offset
+
+        # identifies the dataset and reference configuration in result cache keys. Confusion
+        # counts depend on which rows each filter state selects, so without the source's
+        # content hash (see app.py) every row's filter and reference values are hashed
+        digest = hashlib.sha256()
+        if fingerprint is None:
+            digest.update(self.row_cells.tobytes())
+            for slots in self.reference_slots.values():
+                digest.update(slots.tobytes())
+            digest.update(df["selected_outcome_cleaned"].cat.codes.to_numpy().tobytes())
+            digest.update(df["call_date"].to_numpy().astype("datetime64[D]").tobytes())
+        else:
+            digest.update(fingerprint.encode())
+        digest.update(json.dumps([
+            self.label_names.tolist(), {c: v.tolist() for c, v in self.reference_names.items()}, references
+        ], sort_keys=True).encode())
+        self.fingerprint = digest.hexdigest()
+
+    # (label, reference value, confidence slot) counts for the given row positions, for every
+    # reference at once
+    def confusion(self, positions):
+        row_cells = self.row_cells[positions]
+        cells = np.concatenate([
+            self.offsets[column] + self.reference_slots[column][positions] * self.row_size + row_cells
+            for column in self.references
+        ])
+        counts = np.bincount(cells, minlength=self.size)
+
+        result = {}
+        for column in self.references:
+            n_values = len(self.reference_names[column]) + 1
+            block = counts[self.offsets[column]:self.offsets[column] + n_values * self.row_size]
+            result[column] = ConfusionCounts(
+                self.label_names,
+                self.reference_names[column],
+                self.lookups[column],
+                block.reshape(n_values, len(self.label_names) + 1, N_SLOTS).transpose(1, 0, 2)
+            )
+        return result
+
+
+class ConfusionCounts:
+
+    # (label slot, reference slot, confidence slot) counts for one reference and filter state;
+    # slot 0 on the label and reference axes holds missing values, the last confidence slot
+    # rows without a score
+    def __init__(self, label_names, reference_names, lookup, counts):
+        self.label_names = label_names
+        self.reference_names = reference_names
+        self.lookup = lookup
+        self.counts = counts
+
+        # reference values with calls, most frequent first; built with the counts, so once
+        # per cached filter state and never on a top x slider move
+        totals = counts[1:, 1:].sum(axis=(0, 2))
+        order = np.argsort(-totals, kind="stable")
+        self.ranking = order[totals[order] > 0]
+
+
+# label x reference value counts (rows with both values, any confidence)
+def confusion_table(confusion):
+    counts = confusion.counts[1:, 1:].sum(axis=2)
+    return pd.DataFrame(
+        counts,
+        index=pd.CategoricalIndex(confusion.label_names, name=LABEL),
+        columns=pd.Index(confusion.reference_names, name="reference"),
+    )
+
+
+# long label x reference value table for the top_x most frequent values overall (calls with
+# both values, any confidence), as % of each label's calls; everything outside the top x is
+# dropped, or summed into one bucket when other_bucket names it
+def ranked_distribution(confusion, reference, top_x, other_bucket=None):
+    counts = confusion.counts[1:, 1:].sum(axis=2)
+    label_totals = counts.sum(axis=1)
+    top = np.sort(confusion.ranking[:top_x])
+
+    n_labels = len(confusion.label_names)
+    table = pd.DataFrame({
+        LABEL: pd.Categorical.from_codes(np.repeat(np.arange(n_labels), len(top)), categories=confusion.label_names),
+        reference: confusion.reference_names[np.tile(top, n_labels)],
+        "count": counts[:, top].ravel(),
+        "total_calls": np.repeat(label_totals, len(top)),
+    })
+
+    if other_bucket is not None:
+        table = pd.concat([table, pd.DataFrame({
+            LABEL: pd.Categorical.from_codes(np.arange(n_labels), categories=confusion.label_names),
+            reference: other_bucket,
+            "count": label_totals - counts[:, top].sum(axis=1),
+            "total_calls": label_totals,
+        })]).sort_values(LABEL, kind="stable")
+
+    # like a grouped count, only (label, value) pairs with calls
+    table = table[table["count"] > 0].reset_index(drop=True)
+    return table.assign(pct_of_label=table["count"] / table["total_calls"] * 100)
+
+
+# alignment of llm labels with the reference at every minimum confidence: counts are
+# reverse-cumulated over confidence, so the slider only picks a precomputed row
+def alignment_by_confidence(confusion):
+    n_labels = len(confusion.label_names)
+
+    # rows with a reference value and a confidence score, split by how the reference maps
+    scored = confusion.counts[:, 1:, :-1]
+    lookup = confusion.lookup[1:]
+    label_codes = np.arange(-1, n_labels)[:, None]
+
+    calls = at_or_above(scored.sum(axis=1))
+    mapped_count = at_or_above(scored[:, lookup >= 0].sum(axis=1))
+    match_count = at_or_above((scored * ((lookup == label_codes) & (label_codes >= 0))[:, :, None]).sum(axis=1))
+
+    # one row per (label, threshold); like the grouped tables, only labels with mapped calls
+    table = pd.DataFrame({
+        LABEL: pd.Categorical.from_codes(
+            np.repeat(np.arange(n_labels), len(THRESHOLDS)), categories=confusion.label_names
+        ),
+        "min_confidence": np.tile(THRESHOLDS, n_labels),
+        "mapped_count": mapped_count[1:].ravel(),
+        "match_count": match_count[1:].ravel(),
+        "label_reason_count": calls[1:].ravel(),
+    })
+    table = table[table["mapped_count"] > 0].reset_index(drop=True)
+    table["alignment_pct"] = table["match_count"] / table["label_reason_count"] * 100
+
+    # all calls with a reference value at each threshold, labelled or not
+    total = pd.DataFrame({
+        "min_confidence": THRESHOLDS,
+        "calls": calls.sum(axis=0),
+        "match_count": match_count.sum(axis=0),
+    })
+    total["alignment_pct"] = total["match_count"] / total["calls"].replace(0, np.nan) * 100
+
+    return {"label": table, "total": total}
+
+
+# confusion counts for every configured reference under the filter state, shared across
+# reruns and sessions via the result cache (the confidence sliders never recompute them)
+def compute_alignment(engine, filter_index, selected_labels, selected_outcomes, start_date, end_date):
+    state_key = filter_state_key(
+        selected_labels, selected_outcomes, start_date, end_date, dataset=engine.fingerprint
+    )
+    return cached_result(
+        "alignment.confusion",
+        state_key,
+        lambda: engine.confusion(filter_index.resolve(selected_labels, selected_outcomes, start_date, end_date))
+    )
@@ -0,0 +1,159 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from utils.alignment import LABEL, confusion_table
+
+# headless data work behind the views: pure functions from frames, aggregates or row
+# selections plus parameters to tables, with no streamlit calls, so they can be timed and
+# profiled outside a running server (see benchmarks/compute_suite.py). The views only
+# format and draw what these return; the cached aggregates they start from live in
+# utils/metrics.py and utils/alignment.py, and risk scoring in utils/risk.py
+
+
+################
+### overview ###
+################
+
+# label or outcome summary (key column plus volume, costs and rates), largest first, with
+# each group's share of the filtered calls and of all calls
+def summary_table(grouped, key, total_all):
+    table = (
+        grouped
+        .rename(columns={"repeat_rate_7d": "call_rate_7d"})
+        [[key, "volume", "avg_outcome_cost", "total_outcome_cost", "call_rate_7d", "churn_rate_30d"]]
+        .sort_values("volume", ascending=False)
+    )
+    return table.assign(
+        pct_filtered=table["volume"] / table["volume"].sum(),
+        pct_all_calls=table["volume"] / total_all
+    )
+
+
+########################
+### outcome analysis ###
+########################
+
+# label x outcome aggregates with each row's share of the filtered calls and of all calls
+def outcome_shares(label_outcome, total_all):
+    return label_outcome.assign(
+        pct_total_volume=label_outcome["volume"] / label_outcome["volume"].sum(),
+        pct_total_all=label_outcome["volume"] / total_all
+    )
+
+
+# outcome mix within each label (each label totals 100)
+def within_label_shares(shares):
+    return shares.assign(
+        pct_within_label=shares["volume"] / shares.groupby(LABEL, observed=True)["volume"].transform("sum") * 100
+    )
+
+
+# breakdown table order: largest label x outcome rows first
+def breakdown_rows(shares):
+    return shares.sort_values(by="volume", ascending=False).reset_index(drop=True)
+
+
+########################
+### label evaluation ###
+########################
+
+# calls with a reference value per label, with the "label (n.nk)" axis title used by the
+# distribution charts; only labels with such calls
+def reference_label_totals(confusion):
+    totals = pd.DataFrame({
+        LABEL: pd.Categorical(confusion.label_names, categories=confusion.label_names),
+        "total_calls": confusion.counts[1:, 1:].sum(axis=(1, 2)),
+    })
+    totals = totals[totals["total_calls"] > 0]
+    return totals.assign(
+        label_with_total=totals[LABEL].astype(str) + " (" + (totals["total_calls"] / 1000).round(1).astype(str) + "k)"
+    )
+
+
+# long label x reference value table as % of each label's calls, dropping labels and
+# values without calls
+def reference_mix_table(confusion):
+    mix = (
+        confusion_table(confusion)
+        .stack()
+        .rename("count")
+        .reset_index()
+    )
+    mix = mix.assign(
+        pct_of_label=mix["count"] / mix.groupby(LABEL, observed=True)["count"].transform("sum").replace(0, np.nan) * 100
+    )
+    mix = mix[mix.groupby("reference", observed=True)["count"].transform("sum") > 0]
+    return mix[mix.groupby(LABEL, observed=True)["count"].transform("sum") > 0]
+
+
+# calls per confidence score, binned 1-10 (bin k holds scores in (k - 1, k])
+def confidence_distribution(confidence):
+    confidence_bin = pd.cut(
+        confidence,
+        bins=list(range(0, 11)),   # 0-10 edges
+        labels=list(range(1, 11)), # 1-10 labels
+        include_lowest=True,
+        right=True
+    ).rename("confidence_bin")
+
+    return (
+        confidence.groupby(confidence_bin, observed=True)
+        .size()
+        .reset_index(name="count")
+    )
+
+
+################
+### raw data ###
+################
+
+# narrower selection for the raw data search box and repeat / churn dropdowns
+# ("All", "Yes" or "No")
+def filter_rows(selection, search_index, search_term="", repeat_filter="All", churn_filter="All"):
+    if search_term.strip():
+        # look up matching row positions in the prebuilt search index
+        selection = selection.intersect(search_index.search(search_term))
+
+    for column, choice in [("sc_call_next_7d_flag", repeat_filter), ("bb_churn_next_30d", churn_filter)]:
+        if choice != "All" and column in selection.df.columns:
+            selection = selection.where(selection.values(column) == (1 if choice == "Yes" else 0))
+
+    return selection
+
+
+# row order of a selection sorted by one column (None keeps dataset order); missing values
+# always last
+def row_order(selection, sort_col=None, descending=True):
+    if sort_col is None:
+        return np.arange(len(selection))
+
+    values = selection.values(sort_col)
+    if np.issubdtype(values.dtype, np.datetime64):
+        values = values.astype("datetime64[D]").astype(np.float64)
+    values = values.astype(np.float64)
+    if descending:
+        values = -values
+    return np.argsort(values, kind="stable")
+
+
+# one page of rows in the given order, with the lazily loaded text columns fetched for the
+# page only; columns keep the order given
+def page_rows(selection, text_data, order, page, page_size, columns):
+    start = (page - 1) * page_size
+    page_order = order[start:start + page_size]
+
+    df_page = selection.take([c for c in columns if c in selection.df.columns], order=page_order)
+    df_page = pd.concat([df_page, text_data.iloc[selection.positions[page_order]]], axis=1)
+    return df_page[[c for c in columns if c in df_page.columns]].reset_index(drop=True)
+
+
+# csv of every row of the selection in the given order, with columns renamed, written a
+# chunk of rows at a time so the text columns are never taken for the whole selection at once
+def selection_csv(selection, text_data, order, columns, names=None, chunk_size=100_000):
+    buffer = io.StringIO()
+    for page in range(1, max(1, -(-len(order) // chunk_size)) + 1):
+        chunk = page_rows(selection, text_data, order, page, chunk_size, columns)
+        chunk.rename(columns=names or {}).to_csv(buffer, header=page == 1, index=False)
+    return buffer.getvalue().encode()
@@ -0,0 +1,93 @@
+import hashlib
+import json
+
+import numpy as np
+
+from utils.filter_index import to_day
+
+# additive measures stored per (label, outcome, day) cell
+MEASURES = ["volume", "repeat_7d", "churn_30d", "churn_60d", "cost_sum", "cost_count"]
+
+# grouping columns
+LABEL = "label"
+OUTCOME = "selected_outcome_cleaned"
+
+
+class MetricsCube:
+
+    # dense array of counts and sums keyed by (label, outcome, call day), built once per
+    # dataset load; every global filter is a condition on one of its three axes
+    def __init__(self, df):
+        labels = df[LABEL].cat
+        outcomes = df[OUTCOME].cat
+
+        self.label_names = np.array(labels.categories, dtype=object)
+        self.outcome_names = np.array(outcomes.categories, dtype=object)
+
+        label_codes = labels.codes.to_numpy().astype(np.int64)
+        outcome_codes = outcomes.codes.to_numpy().astype(np.int64)
+        days = df["call_date"].to_numpy().astype("datetime64[D]").astype(np.int64)
+
+        self.min_day = int(days.min()) if len(days) else 0
+        self.n_days = int(days.max()) - self.min_day + 1 if len(days) else 0
+
+        # rows with a missing label or outcome never match the global filters
+        valid = (label_codes >= 0) & (outcome_codes >= 0)
+        cells = (
+            (label_codes[valid] * len(self.outcome_names) + outcome_codes[valid]) * self.n_days
+            + (days[valid] - self.min_day)
+        )
+
+        cost = df["outcome_cost"].to_numpy()[valid].astype(np.float64)
+        has_cost = ~np.isnan(cost)
+
+        weights = {
+            "volume": None,
+            "repeat_7d": df["sc_call_next_7d_flag"].to_numpy()[valid],
+            "churn_30d": df["bb_churn_next_30d"].to_numpy()[valid],
+            "churn_60d": df["bb_churn_next_60d"].to_numpy()[valid],
+            "cost_sum": np.where(has_cost, cost, 0.0),
+            "cost_count": has_cost,
+        }
+
+        size = len(self.label_names) * len(self.outcome_names) * self.n_days
+        shape = (len(self.label_names), len(self.outcome_names), self.n_days)
+        daily = np.stack(
+            [np.bincount(cells, weights=weights[m], minlength=size).reshape(shape) for m in MEASURES],
+            axis=-1
+        )
+
+        # prefix sums over the day axis (with a leading zero day), so the totals for any
+        # date window are one subtraction per cell: cumulative[end + 1] - cumulative[start]
+        self.cumulative = np.zeros(shape[:2] + (self.n_days + 1, len(MEASURES)))
+        np.cumsum(daily, axis=2, out=self.cumulative[:, :, 1:])
+
+        # identifies the cube's contents in result cache keys: every day's sums, not only the
+        # totals, since datasets with the same totals can differ within any date window
+        digest = hashlib.sha256(self.cumulative.tobytes())
+        digest.update(json.dumps([self.label_names.tolist(), self.outcome_names.tolist(), self.min_day]).encode())
+        self.fingerprint = digest.hexdigest()
+
+    # totals for the filter state in constant time per cell, keeping the label and outcome axes
+    def select(self, selected_labels, selected_outcomes, start_date, end_date):
+        start = max(to_day(start_date) - self.min_day, 0)
+        end = min(to_day(end_date) - self.min_day, self.n_days - 1)
+
+        if start <= end:
+            values = self.cumulative[:, :, end + 1] - self.cumulative[:, :, start]
+        else:
+            values = np.zeros(self.cumulative.shape[:2] + (len(MEASURES),))
+
+        values[~np.isin(self.label_names, list(selected_labels))] = 0
+        values[:, ~np.isin(self.outcome_names, list(selected_outcomes))] = 0
+
+        return CubeSlice(self.label_names, self.outcome_names, values)
+
+
+class CubeSlice:
+
+    # (label, outcome, measure) sums for one filter state, aggregated by utils/metrics.py
+    def __init__(self, label_names, outcome_names, values):
+        self.label_names = label_names
+        self.outcome_names = outcome_names
+        self.values = values
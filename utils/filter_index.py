@@ -0,0 +1,80 @@
+import numpy as np
+
+
+# day number for a date, datetime or datetime64 value
+def to_day(value):
+    return np.datetime64(value, "D").astype(np.int64)
+
+
+class FilterIndex:
+
+    # built once per dataset load: row positions grouped by (label, outcome) cell and
+    # sorted by call date within each cell, so any global filter state resolves to a set
+    # of contiguous slices found by binary search instead of full-column boolean passes
+    def __init__(self, df):
+        labels = df["label"].cat
+        outcomes = df["selected_outcome_cleaned"].cat
+
+        self.labels = {label: i for i, label in enumerate(labels.categories)}
+        self.outcomes = {outcome: i for i, outcome in enumerate(outcomes.categories)}
+        self.n_rows = len(df)
+
+        label_codes = labels.codes.to_numpy().astype(np.int64)
+        outcome_codes = outcomes.codes.to_numpy().astype(np.int64)
+        days = df["call_date"].to_numpy().astype("datetime64[D]").astype(np.int64)
+
+        # rows with a missing label or outcome never match the isin filters
+        positions = np.flatnonzero((label_codes >= 0) & (outcome_codes >= 0))
+
+        self.min_day = int(days.min()) if len(days) else 0
+        self.max_day = int(days.max()) if len(days) else -1
+        self.day_span = self.max_day - self.min_day + 1
+
+        # one sortable key per row: cell first, then day offset within the date range
+        cells = label_codes[positions] * len(self.outcomes) + outcome_codes[positions]
+        keys = cells * self.day_span + (days[positions] - self.min_day)
+
+        order = np.argsort(keys, kind="stable")
+        self.positions = positions[order]
+        self.keys = keys[order]
+
+    # slice bounds into self.positions for every selected cell within the date window
+    def _bounds(self, selected_labels, selected_outcomes, start_date, end_date):
+        label_ids = np.array([self.labels[x] for x in selected_labels if x in self.labels], dtype=np.int64)
+        outcome_ids = np.array([self.outcomes[x] for x in selected_outcomes if x in self.outcomes], dtype=np.int64)
+
+        start = max(to_day(start_date) - self.min_day, 0)
+        end = min(to_day(end_date) - self.min_day, self.day_span - 1)
+
+        if not len(label_ids) or not len(outcome_ids) or start > end:
+            empty = np.array([], dtype=np.int64)
+            return empty, empty
+
+        cells = (label_ids[:, None] * len(self.outcomes) + outcome_ids[None, :]).ravel()
+        lo = np.searchsorted(self.keys, cells * self.day_span + start, side="left")
+        hi = np.searchsorted(self.keys, cells * self.day_span + end, side="right")
+        return lo, hi
+
+    # number of rows matching the filter state, from the slice bounds alone (no positions
+    # are gathered, so it is cheap enough for a live preview while filters are edited)
+    def count(self, selected_labels, selected_outcomes, start_date, end_date):
+        lo, hi = self._bounds(selected_labels, selected_outcomes, start_date, end_date)
+        return int((hi - lo).sum())
+
+    # sorted row positions matching the filter state (cost grows with matching rows only)
+    def resolve(self, selected_labels, selected_outcomes, start_date, end_date):
+        lo, hi = self._bounds(selected_labels, selected_outcomes, start_date, end_date)
+
+        lengths = hi - lo
+        total = int(lengths.sum())
+        if total == 0:
+            return np.array([], dtype=np.int64)
+
+        # concatenate the slices without a python loop: each output slot is the slice start
+        # plus its offset within the slice
+        offsets = np.repeat(lo - (np.cumsum(lengths) - lengths), lengths)
+        selected = self.positions[offsets + np.arange(total)]
+
+        # keep the original row order of the dataset
+        selected.sort()
+        return selected
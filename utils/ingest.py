@@ -0,0 +1,109 @@
+import hashlib
+import json
+import re
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from utils.schema import apply_schema
+
+# bump when the csv parsing below changes so old columnar files are rebuilt
+INGEST_VERSION = 2
+
+# columnar copies live next to the source csv
+CACHE_DIR_NAME = ".cache"
+
+# wide free-text columns, only read for views that display or search them
+TEXT_COLUMNS = ["long_reason", "evidence"]
+
+
+# hash the source file in chunks so large csvs never sit in memory
+def file_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# content hash of the source csv, reusing the last hash while size and mtime are unchanged
+def source_hash(csv_path):
+    csv_path = Path(csv_path)
+    stat = csv_path.stat()
+    manifest_path = csv_path.parent / CACHE_DIR_NAME / f"{csv_path.stem}.manifest.json"
+
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text())
+        if manifest.get("size") == stat.st_size and manifest.get("mtime_ns") == stat.st_mtime_ns:
+            return manifest["sha256"]
+
+    sha256 = file_hash(csv_path)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps({
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": sha256
+    }))
+    return sha256
+
+
+# parse and type the raw csv (slow path, only runs when the source changes)
+def read_label_csv(csv_path):
+    df = pd.read_csv(
+        csv_path,
+        dtype={"other_label": "string"}
+    )
+    return apply_schema(df)
+
+
+# path of the columnar copy for the current source content
+def columnar_path(csv_path):
+    csv_path = Path(csv_path)
+    digest = source_hash(csv_path)[:16]
+    return csv_path.parent / CACHE_DIR_NAME / f"{csv_path.stem}_v{INGEST_VERSION}_{digest}.parquet"
+
+
+# convert the csv to parquet once per content hash and return the parquet path
+def ingest(csv_path):
+    csv_path = Path(csv_path)
+    parquet_path = columnar_path(csv_path)
+
+    if not parquet_path.exists():
+        df = read_label_csv(csv_path)
+
+        # write to a temp file first so a crash never leaves a partial cache behind
+        tmp_path = parquet_path.with_suffix(".parquet.tmp")
+        df.to_parquet(tmp_path, index=False)
+        tmp_path.replace(parquet_path)
+
+        # drop columnar copies of older versions of the same source (matched exactly, so a
+        # csv whose name starts with this one keeps its own copy)
+        own = re.compile(rf"{re.escape(csv_path.stem)}_v\d+_[0-9a-f]+\.parquet")
+        for stale in parquet_path.parent.iterdir():
+            if stale != parquet_path and own.fullmatch(stale.name):
+                stale.unlink(missing_ok=True)
+
+    return parquet_path
+
+
+# column names available in the columnar copy
+def columnar_columns(csv_path):
+    return pq.read_schema(ingest(csv_path)).names
+
+
+# load the dataset (or just the given columns) from its columnar copy, building it first if needed
+def load_columnar(csv_path, columns=None):
+    return pd.read_parquet(ingest(csv_path), columns=columns)
+
+
+# every column except the wide text ones
+def load_narrow_columns(csv_path):
+    columns = [c for c in columnar_columns(csv_path) if c not in TEXT_COLUMNS]
+    return load_columnar(csv_path, columns=columns)
+
+
+# the wide text columns, row-aligned with load_narrow_columns
+def load_text_columns(csv_path):
+    columns = [c for c in columnar_columns(csv_path) if c in TEXT_COLUMNS]
+    return load_columnar(csv_path, columns=columns)
@@ -0,0 +1,87 @@
+import os
+import resource
+import sys
+
+import numpy as np
+import pandas as pd
+
+# memory accounting for the admin page and the load test: sizes of the shared dataset,
+# indexes and cache entries, and of what each session holds. Sizes are numpy / pandas
+# aware (array buffers and deep string sizes) and count shared buffers once, which the
+# generic object walkers get wrong or take minutes over at 10M rows
+
+
+# resident set size of this process in bytes (peak size where /proc is unavailable)
+def process_rss():
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+# deep memory per column of a frame, largest first, with dtype and share of the total
+def frame_memory(df):
+    usage = df.memory_usage(deep=True, index=False)
+    return pd.DataFrame({
+        "column": usage.index,
+        "dtype": [str(df[c].dtype) for c in usage.index],
+        "bytes": usage.to_numpy(),
+        "pct": usage.to_numpy() / max(usage.sum(), 1) * 100,
+    }).sort_values("bytes", ascending=False, ignore_index=True)
+
+
+# bytes held by an object and everything it references: array buffers, frames (deep),
+# containers and plain objects' attributes; buffers shared between arrays (views,
+# copy-on-write frames) and objects reachable twice are counted once
+def deep_size(obj, seen=None):
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        base = obj
+        while isinstance(base.base, np.ndarray):
+            base = base.base
+        if base is not obj:
+            return deep_size(base, seen)
+        size = obj.nbytes
+        if obj.dtype == object:
+            size += sum(deep_size(x, seen) for x in obj.ravel())
+        return size
+
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(deep_size(x, seen) for x in obj)
+
+    if hasattr(obj, "__dict__") and not isinstance(obj, type):
+        return sys.getsizeof(obj) + deep_size(vars(obj), seen)
+
+    return sys.getsizeof(obj)
+
+
+# session state of every live session on this server by session id (None when unavailable:
+# outside a running server, e.g. under AppTest, or when the session manager can't be read).
+# The runtime has no public accessor for its sessions, and its own session state stat walks
+# every resource cache entry as well, so the private session manager is read directly; any
+# streamlit release that changes it makes the sessions unavailable rather than raising
+def live_session_states():
+    from streamlit import runtime
+
+    if not runtime.exists():
+        return None
+
+    try:
+        return {
+            info.session.id: info.session.session_state.filtered_state
+            for info in runtime.get_instance()._session_mgr.list_active_sessions()
+        }
+    except Exception:
+        return None
@@ -0,0 +1,82 @@
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+from utils.cube import MEASURES, LABEL, OUTCOME
+from utils.result_cache import cached_result
+
+
+# canonical, order-insensitive hash of the global filter state plus any view parameters
+def filter_state_key(selected_labels, selected_outcomes, start_date, end_date, **params):
+    payload = {
+        "labels": sorted(str(x) for x in selected_labels),
+        "outcomes": sorted(str(x) for x in selected_outcomes),
+        "start_date": str(start_date),
+        "end_date": str(end_date),
+        "params": params,
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+# volume, rates and costs from stacked measure sums (one row per group)
+def derive_metrics(sums):
+    sums = pd.DataFrame(sums, columns=MEASURES)
+    volume = sums["volume"].replace(0, np.nan)
+    return pd.DataFrame({
+        "volume": sums["volume"].astype(np.int64),
+        "repeat_rate_7d": sums["repeat_7d"] / volume,
+        "churn_rate_30d": sums["churn_30d"] / volume,
+        "churn_rate_60d": sums["churn_60d"] / volume,
+        "avg_outcome_cost": sums["cost_sum"] / sums["cost_count"].replace(0, np.nan),
+        "total_outcome_cost": sums["cost_sum"],
+    })
+
+
+# overall, by-label, by-outcome and by-label x outcome aggregates for one cube slice (like
+# sql grouping sets), derived together from a single stacked array of measure sums
+def grouping_sets(cube_slice):
+    values = cube_slice.values
+    n_labels, n_outcomes = values.shape[:2]
+    labels = cube_slice.label_names
+    outcomes = cube_slice.outcome_names
+
+    blocks = {
+        "overall": (values.sum(axis=(0, 1))[None, :], {}),
+        "label": (values.sum(axis=1), {LABEL: labels}),
+        "outcome": (values.sum(axis=0), {OUTCOME: outcomes}),
+        "label_outcome": (
+            values.reshape(n_labels * n_outcomes, -1),
+            {LABEL: np.repeat(labels, n_outcomes), OUTCOME: np.tile(outcomes, n_labels)}
+        ),
+    }
+
+    derived = derive_metrics(np.concatenate([sums for sums, _ in blocks.values()]))
+    bounds = np.cumsum([0] + [len(sums) for sums, _ in blocks.values()])
+
+    tables = {}
+    for (name, (_, keys)), lo, hi in zip(blocks.items(), bounds[:-1], bounds[1:]):
+        table = pd.concat([pd.DataFrame(keys), derived.iloc[lo:hi].reset_index(drop=True)], axis=1)
+
+        # grouped tables only list groups with calls (like groupby with observed=True)
+        if keys:
+            table = table[table["volume"] > 0].reset_index(drop=True)
+
+        tables[name] = table
+
+    return tables
+
+
+# grouping sets for the filter state, shared across views and sessions via the result cache
+def compute_metrics(cube, selected_labels, selected_outcomes, start_date, end_date):
+    state_key = filter_state_key(
+        selected_labels, selected_outcomes, start_date, end_date, dataset=cube.fingerprint
+    )
+    return cached_result(
+        "metrics.grouping_sets",
+        state_key,
+        lambda: grouping_sets(cube.select(selected_labels, selected_outcomes, start_date, end_date)),
+        persist=True
+    )
@@ -0,0 +1,169 @@
+import contextlib
+import contextvars
+import functools
+import json
+import logging
+import os
+import sys
+import time
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# one json line per timing span; set DASHBOARD_SPAN_LOG to "stderr" or a file path to write
+# them out (otherwise they go to the standard logging tree at info level)
+logger = logging.getLogger(__name__)
+
+SPAN_LOG = os.environ.get("DASHBOARD_SPAN_LOG")
+if SPAN_LOG and not logger.handlers:
+    handler = logging.StreamHandler(sys.stderr) if SPAN_LOG == "stderr" else logging.FileHandler(SPAN_LOG)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+# session state keys for the section run log and the sidebar toggle that shows it
+RUN_LOG = "section_run_log"
+RUN_ID = "section_run_id"
+SHOW_RUNS = "show_section_runs"
+
+# interactions kept in the run log
+RUN_LOG_SIZE = 20
+
+# names of the spans the current code runs inside (sections and fragments can nest)
+_path = contextvars.ContextVar("span_path", default=())
+
+
+# new entry in the run log: a full script run, or a fragment rerun that skipped app.py
+def _start_interaction(kind):
+    run_id = st.session_state.get(RUN_ID, 0) + 1
+    st.session_state[RUN_ID] = run_id
+
+    log = st.session_state.setdefault(RUN_LOG, [])
+    log.append({"run": run_id, "kind": kind, "sections": [], "spans": [], "start": time.perf_counter()})
+    del log[:-RUN_LOG_SIZE]
+
+
+# called at the top of app.py: every section of the active view runs after this
+def begin_run():
+    _start_interaction("full")
+
+
+# true while streamlit is rerunning fragments only
+def _fragment_rerun():
+    ctx = get_script_run_ctx()
+    return ctx is not None and bool(ctx.fragment_ids_this_run)
+
+
+# time a block of a run (data loading, filtering, a chart or table call, ...); spans inside
+# other spans are recorded under them, and each one is added to the current run log entry
+# and written as a json log line
+@contextlib.contextmanager
+def span(name):
+    path = _path.get() + (name,)
+    token = _path.set(path)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _path.reset(token)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        span_path = " > ".join(path)
+
+        # spans also time work outside a script run (the warm-up thread, benchmarks)
+        ctx = get_script_run_ctx(suppress_warning=True)
+        entry = st.session_state[RUN_LOG][-1] if ctx is not None and st.session_state.get(RUN_LOG) else None
+        if entry is not None:
+            entry["spans"].append({
+                "name": name,
+                "path": span_path,
+                "depth": len(path) - 1,
+                "start_ms": (start - entry["start"]) * 1000,
+                "ms": elapsed_ms,
+            })
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({
+                "event": "span",
+                "span": span_path,
+                "ms": round(elapsed_ms, 3),
+                "run": entry["run"] if entry else None,
+                "kind": entry["kind"] if entry else None,
+                "session": ctx.session_id if ctx is not None else None,
+                "ts": round(time.time(), 3),
+            }))
+
+
+# decorator turning a view section into an st.fragment, so its widgets rerun only that
+# section (with the upstream data it was last given), and recording every run of it; the
+# name may use the keyword arguments of the call, e.g. "reasons.{key}"
+def section(name):
+    def decorator(func):
+
+        @functools.wraps(func)
+        def run(*args, **kwargs):
+            if not _path.get() and (_fragment_rerun() or RUN_LOG not in st.session_state):
+                _start_interaction("fragment" if _fragment_rerun() else "full")
+
+            section_name = name.format(**kwargs)
+            start = time.perf_counter()
+            try:
+                with span(section_name):
+                    return func(*args, **kwargs)
+            finally:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+
+                entry = st.session_state[RUN_LOG][-1]
+                entry["sections"].append(section_name)
+
+                if st.session_state.get(SHOW_RUNS):
+                    st.caption(f"Section ran in interaction {entry['run']} ({entry['kind']}, {elapsed_ms:,.0f} ms)")
+
+        return st.fragment(run)
+
+    return decorator
+
+
+# sidebar tables of recent interactions and the sections each one ran (newest first), and
+# of every span timed in the current run; refreshed on full runs, while each section's own
+# caption updates on fragment reruns
+def render_run_log():
+    log = st.session_state.get(RUN_LOG, [])
+    if not log:
+        return
+
+    st.dataframe(
+        pd.DataFrame({
+            "Run": [entry["run"] for entry in log],
+            "Kind": [entry["kind"] for entry in log],
+            "Sections": [len(entry["sections"]) for entry in log],
+            "Ran": [", ".join(entry["sections"]) for entry in log],
+        }).iloc[::-1],
+        hide_index=True,
+        width='stretch'
+    )
+
+    # spans in the order they started, indented under the span they ran in, with their
+    # median over the recent interactions that ran them
+    spans = sorted(log[-1]["spans"], key=lambda s: s["start_ms"])
+    if not spans:
+        return
+
+    history = pd.DataFrame([s for entry in log for s in entry.get("spans", [])])
+    medians = history.groupby("path")["ms"].median()
+
+    st.caption(f"Timing spans of run {log[-1]['run']} (ms)")
+    st.dataframe(
+        pd.DataFrame({
+            "Span": ["\u2003" * s["depth"] + s["name"] for s in spans],
+            "ms": [s["ms"] for s in spans],
+            "Median ms": [medians[s["path"]] for s in spans],
+        }),
+        hide_index=True,
+        width='stretch',
+        column_config={
+            "ms": st.column_config.NumberColumn(format="%.1f"),
+            "Median ms": st.column_config.NumberColumn(format="%.1f"),
+        }
+    )
@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+import streamlit as st
+
+from utils.memory import deep_size
+
+# filter-dependent results (grouping sets, confusion counts and the view tables built from
+# them) held once per process and shared by every session, bounded by entry count, total
+# bytes and age. Entries are evicted least recently used first; values are returned as
+# stored, not copied, so callers must treat them as read-only (derive new frames with
+# .assign / .rename as the views already do). With a ResultStore attached, results cached
+# with persist=True are reloaded from disk when missing from memory before being computed,
+# and written there once computed (see utils/result_store.py)
+
+# limits, overridable per deployment
+MAX_ENTRIES = int(os.environ.get("DASHBOARD_RESULT_CACHE_ENTRIES", 1024))
+MAX_BYTES = int(float(os.environ.get("DASHBOARD_RESULT_CACHE_MB", 256)) * 1e6)
+TTL_SECONDS = float(os.environ.get("DASHBOARD_RESULT_CACHE_TTL", 3600))
+
+
+class ResultCache:
+
+    # thread-safe lru cache of computed results with entry, byte and ttl limits
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES, ttl=TTL_SECONDS, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+
+        self._entries = OrderedDict()   # key -> (value, bytes, expires)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._computing = {}            # key -> lock held while one thread computes it
+        self.hits = self.misses = self.evictions = self.expirations = 0
+        self.store = None
+
+    # second tier on disk, shared with other processes and restarts of this one
+    def attach_store(self, store):
+        self.store = store
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= self.clock():
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    # stores a result, evicting least recently used entries until the limits hold; results
+    # larger than the whole byte budget are not stored
+    def put(self, key, value):
+        size = deep_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, size, self.clock() + self.ttl)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    # cached result for key (from memory, else from the attached store when persisted),
+    # computed once even when several sessions ask at the same time
+    def get_or_compute(self, key, compute, persist=False):
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+
+        with self._lock:
+            key_lock = self._computing.setdefault(key, threading.Lock())
+        with key_lock:
+            # another session may have stored it while this one waited
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None and entry[2] > self.clock():
+                return entry[0]
+            store = self.store if persist else None
+            try:
+                value = store.load(*key) if store is not None else None
+                if value is None:
+                    value = compute()
+                    if store is not None:
+                        store.save(*key, value)
+                self.put(key, value)
+            finally:
+                with self._lock:
+                    self._computing.pop(key, None)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    # one row per live entry: namespace, size, age and seconds left before it expires
+    def entries(self):
+        now = self.clock()
+        with self._lock:
+            rows = [
+                (key[0], size, now - (expires - self.ttl), expires - now)
+                for key, (_, size, expires) in self._entries.items()
+            ]
+        return pd.DataFrame(rows, columns=["namespace", "bytes", "age_s", "ttl_s"])
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+# the process-wide cache shared by every session
+@st.cache_resource
+def result_cache():
+    return ResultCache()
+
+
+# canonical key for a result: the filter state key (already order-insensitive, see
+# utils/metrics.py filter_state_key) plus the view parameters it depends on
+def result_key(state_key, **params):
+    encoded = json.dumps({"state": state_key, "params": params}, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+# result of compute() for this namespace, filter state and parameters, from the shared cache;
+# persist=True also keeps it in the disk store, for tables keyed on the filters alone (results
+# keyed on sliders would be written on every drag)
+def cached_result(namespace, state_key, compute, persist=False, **params):
+    return result_cache().get_or_compute((namespace, result_key(state_key, **params)), compute, persist)
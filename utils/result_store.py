@@ -0,0 +1,154 @@
+import os
+import re
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+from utils.ingest import CACHE_DIR_NAME, source_hash
+
+# computed aggregates on local disk, so results survive restarts and deploys: for results
+# cached with persist=True (the filter-keyed base tables, never slider-keyed ones that would
+# be written on every drag) the result cache (utils/result_cache.py) looks here on a memory
+# miss before computing, and writes what it computes back. Only tables are stored (a frame,
+# or a dict of frames such as the grouping sets), as parquet under a directory per source
+# content hash, so a changed csv never reloads old results; directories of older content
+# are deleted when the store opens
+
+# bump when a cached computation changes its output so old results are not reloaded
+RESULT_STORE_VERSION = 1
+
+# disk budget, least recently used results are deleted past it
+MAX_BYTES = int(float(os.environ.get("DASHBOARD_RESULT_STORE_MB", 512)) * 1e6)
+
+
+# frames as {name: frame} (a plain frame is stored under "")
+def _frames(value):
+    if isinstance(value, pd.DataFrame):
+        return {"": value}
+    if isinstance(value, dict) and value and all(
+        isinstance(k, str) and isinstance(v, pd.DataFrame) for k, v in value.items()
+    ):
+        return value
+    return None
+
+
+class ResultStore:
+
+    def __init__(self, csv_path, max_bytes=MAX_BYTES):
+        csv_path = Path(csv_path)
+        self.max_bytes = max_bytes
+        self.root = (
+            csv_path.parent / CACHE_DIR_NAME / "results"
+            / f"{csv_path.stem}_v{RESULT_STORE_VERSION}_{source_hash(csv_path)[:16]}"
+        )
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        # results of older versions or older content of the same source (matched exactly, so a
+        # source whose name starts with this one keeps its results)
+        own = re.compile(rf"{re.escape(csv_path.stem)}_v\d+_[0-9a-f]+")
+        for stale in self.root.parent.iterdir():
+            if stale != self.root and own.fullmatch(stale.name):
+                shutil.rmtree(stale, ignore_errors=True)
+
+        # result directory -> bytes, least recently used first; the disk is scanned once here
+        self._lock = threading.Lock()
+        self._index = OrderedDict(
+            (entry, self._size(entry)) for entry in sorted(self._entries(), key=lambda e: e.stat().st_mtime_ns)
+        )
+        self._bytes = sum(self._index.values())
+        self.loads = self.saves = self.evictions = 0
+
+    def __len__(self):
+        return len(self._index)
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    # one directory per result, holding a parquet file per frame
+    def _path(self, namespace, key):
+        return self.root / namespace / key
+
+    def _entries(self):
+        return [entry for namespace in self.root.iterdir() if namespace.is_dir() for entry in namespace.iterdir()
+                if entry.is_dir() and not entry.name.endswith(".tmp")]
+
+    @staticmethod
+    def _size(entry):
+        return sum(f.stat().st_size for f in entry.iterdir())
+
+    # stored result, or None when there is none (or it cannot be read); reading refreshes its
+    # place in the eviction order (its mtime keeps that order across restarts)
+    def load(self, namespace, key):
+        path = self._path(namespace, key)
+        if not path.is_dir():
+            return None
+        try:
+            frames = {f.stem[1:]: pd.read_parquet(f) for f in sorted(path.glob("*.parquet"))}
+            os.utime(path)
+        except (OSError, ValueError):
+            self._remove(path)
+            return None
+        with self._lock:
+            if path in self._index:
+                self._index.move_to_end(path)
+            self.loads += 1
+        return frames[""] if list(frames) == [""] else frames
+
+    # writes a result if it is made of frames (other results stay in memory only)
+    def save(self, namespace, key, value):
+        frames = _frames(value)
+        path = self._path(namespace, key)
+        if frames is None or path.exists():
+            return
+
+        # write to a temp directory first so a crash never leaves a partial result behind; a
+        # result that fails to write (disk errors, or columns parquet can't hold) stays in
+        # memory only
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            tmp_path.mkdir(parents=True, exist_ok=True)
+            for name, frame in frames.items():
+                frame.to_parquet(tmp_path / f"_{name}.parquet")
+            tmp_path.rename(path)
+        except Exception:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return
+
+        size = self._size(path)
+        with self._lock:
+            self._index[path] = size
+            self._bytes += size
+            self.saves += 1
+        self._evict()
+
+    def _remove(self, path):
+        shutil.rmtree(path, ignore_errors=True)
+        with self._lock:
+            self._bytes -= self._index.pop(path, 0)
+
+    # least recently used results go first until the store fits its budget
+    def _evict(self):
+        while True:
+            with self._lock:
+                if self._bytes <= self.max_bytes or not self._index:
+                    return
+                entry = next(iter(self._index))
+            self._remove(entry)
+            self.evictions += 1
+
+    def clear(self):
+        for entry in list(self._index):
+            self._remove(entry)
+
+    def stats(self):
+        return {
+            "entries": len(self._index),
+            "bytes": self._bytes,
+            "loads": self.loads,
+            "saves": self.saves,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+# kpis scored for risk (higher is riskier for all of them)
+RISK_KPIS = ["repeat_rate_7d", "churn_rate_30d", "avg_outcome_cost"]
+
+# tiers in increasing order of risk
+TIERS = ["Low", "Medium", "High"]
+
+
+# weights scaled to sum to 1 (all zero weights stay zero)
+def normalise_weights(weights):
+    weights = np.asarray(weights, dtype=np.float64)
+    total = weights.sum(axis=-1, keepdims=True)
+    return np.divide(weights, total, out=np.zeros_like(weights), where=total != 0)
+
+
+# 0-1 percentile rank of each kpi, across the whole table or within each group of `by`
+def percentile_scores(table, kpis=RISK_KPIS, by=None):
+    if by is None:
+        ranked = table[kpis].rank(pct=True)
+    else:
+        ranked = table.groupby(by, observed=True)[kpis].rank(pct=True)
+    return ranked.to_numpy(dtype=np.float64)
+
+
+# tier codes (0 = Low, 1 = Medium, 2 = High, -1 = no score) for any array of scores;
+# boundaries are sorted so a crossed pair of sliders never fails
+def tier_codes(risk_scores, low_threshold, med_threshold):
+    low, high = np.minimum(low_threshold, med_threshold), np.maximum(low_threshold, med_threshold)
+    codes = (risk_scores > low).astype(np.int8) + (risk_scores > high).astype(np.int8)
+    return np.where(np.isnan(risk_scores), -1, codes)
+
+
+# percentile ranking, weight normalisation and tier assignment in one vectorised call;
+# weights map kpi column -> importance and need not sum to 1
+def score_risk(table, weights, low_threshold, med_threshold, by=None):
+    kpis = list(weights)
+    scores = percentile_scores(table, kpis, by)
+    risk_scores = scores @ normalise_weights(list(weights.values()))
+
+    tiers = pd.Categorical.from_codes(
+        tier_codes(risk_scores, low_threshold, med_threshold),
+        categories=TIERS,
+        ordered=True
+    )
+
+    return table.assign(
+        **{f"{kpi}_score": scores[:, i] for i, kpi in enumerate(kpis)},
+        risk_score=risk_scores,
+        risk_tier=tiers,
+        risk_pct=(risk_scores * 100).round(1)
+    )
+
+
+# every weight combination on a simplex grid with the given number of steps per unit
+# (steps=20 gives 5% increments and 231 combinations)
+def weight_simplex(steps):
+    i, j = np.meshgrid(np.arange(steps + 1), np.arange(steps + 1), indexing="ij")
+    i, j = i.ravel(), j.ravel()
+    keep = i + j <= steps
+    return np.column_stack([i[keep], j[keep], steps - i[keep] - j[keep]]) / steps
+
+
+# every (low, high) boundary pair with low <= high on a grid over 0-1
+def boundary_grid(steps):
+    edges = np.linspace(0, 1, steps + 1)
+    low, high = np.meshgrid(edges, edges, indexing="ij")
+    keep = low <= high
+    return np.column_stack([low[keep], high[keep]])
+
+
+# share of weight/boundary configurations placing each row in each tier, evaluated for the
+# whole grid in one batched computation: one matrix product scores every row under every
+# weight combination, then binary searches over the sorted boundaries count, per score,
+# how many boundary pairs put it in the low tier (score <= low) or high tier (score > high)
+def sweep_tiers(table, weight_grid, boundaries, kpis=RISK_KPIS, by=None):
+    scores = percentile_scores(table, kpis, by)
+    risk_scores = scores @ normalise_weights(weight_grid).T
+
+    low = np.sort(boundaries[:, 0])
+    high = np.sort(boundaries[:, 1])
+    n_configs = risk_scores.shape[1] * len(boundaries)
+
+    low_share = (len(low) - np.searchsorted(low, risk_scores, side="left")).sum(axis=1) / n_configs
+    high_share = np.searchsorted(high, risk_scores, side="left").sum(axis=1) / n_configs
+    shares = np.column_stack([low_share, 1 - low_share - high_share, high_share])
+
+    # rows without a score (e.g. no cost data) have no tier in any configuration
+    shares[np.isnan(risk_scores).any(axis=1)] = np.nan
+
+    modal = np.where(np.isnan(shares).any(axis=1), -1, np.nan_to_num(shares).argmax(axis=1))
+
+    return table.assign(
+        **{f"{tier.lower()}_share": shares[:, i] for i, tier in enumerate(TIERS)},
+        modal_tier=pd.Categorical.from_codes(modal, categories=TIERS, ordered=True),
+        n_configs=n_configs
+    )
@@ -0,0 +1,78 @@
+import pandas as pd
+
+# label and reason columns with a small set of repeated values
+CATEGORY_COLUMNS = [
+    "label",
+    "selected_outcome_cleaned",
+    "engineer_reported_symptom",
+    "engineer_reported_cause",
+    "engineer_reported_action",
+    "first_csg_call_reason"
+]
+
+# 0/1 behaviour flags (no missing values allowed)
+FLAG_COLUMNS = [
+    "sc_call_next_7d_flag",
+    "bb_churn_next_30d",
+    "bb_churn_next_60d"
+]
+
+# outcome cost in £ (missing allowed, never negative)
+COST_COLUMNS = ["outcome_cost"]
+
+# llm-derived confidence score (missing allowed, 0-10)
+CONFIDENCE_RANGE = (0, 10)
+
+# call dates (no missing values allowed)
+DATE_COLUMNS = ["call_date"]
+
+
+class SchemaError(ValueError):
+    pass
+
+
+# raise with a few example values so bad source data is easy to find
+def _fail(column, problem, bad_values):
+    examples = pd.Series(bad_values).astype(str).unique()[:5].tolist()
+    raise SchemaError(f"Column '{column}' {problem}: {len(bad_values):,} bad rows, e.g. {examples}")
+
+
+# cast the raw csv frame to the compact typed schema, failing fast on bad values
+def apply_schema(df):
+    required = CATEGORY_COLUMNS + FLAG_COLUMNS + COST_COLUMNS + DATE_COLUMNS + ["confidence"]
+    missing = [c for c in required if c not in df.columns]
+    if missing:
+        raise SchemaError(f"Missing required columns: {missing}")
+
+    for col in CATEGORY_COLUMNS:
+        df[col] = df[col].astype("category")
+
+    for col in FLAG_COLUMNS:
+        values = pd.to_numeric(df[col], errors="coerce")
+        bad = ~values.isin([0, 1])
+        if bad.any():
+            _fail(col, "must be 0 or 1", df.loc[bad, col])
+        df[col] = values.astype("int8")
+
+    for col in COST_COLUMNS:
+        values = pd.to_numeric(df[col], errors="coerce")
+        bad = (values.isna() & df[col].notna()) | (values < 0)
+        if bad.any():
+            _fail(col, "must be a non-negative number", df.loc[bad, col])
+        df[col] = values.astype("float32")
+
+    values = pd.to_numeric(df["confidence"], errors="coerce")
+    low, high = CONFIDENCE_RANGE
+    bad = (values.isna() & df["confidence"].notna()) | (values < low) | (values > high)
+    if bad.any():
+        _fail("confidence", f"must be a number between {low} and {high}", df.loc[bad, "confidence"])
+    df["confidence"] = values.astype("float32")
+
+    for col in DATE_COLUMNS:
+        values = pd.to_datetime(df[col], errors="coerce")
+        bad = values.isna()
+        if bad.any():
+            _fail(col, "must be a valid date", df.loc[bad, col])
+        df[col] = values.dt.normalize()
+
+    return df
@@ -0,0 +1,138 @@
+import re
+import shlex
+
+import numpy as np
+import pandas as pd
+
+# searchable columns and the names accepted for field scoping (e.g. evidence:router)
+SEARCH_FIELDS = {
+    "long_reason": ["reason", "long_reason"],
+    "evidence": ["evidence"],
+    "label": ["label"],
+    "selected_outcome_cleaned": ["outcome", "selected_outcome_cleaned"],
+    "engineer_reported_symptom": ["symptom", "engineer_reported_symptom"],
+    "engineer_reported_cause": ["cause", "engineer_reported_cause"],
+    "engineer_reported_action": ["action", "engineer_reported_action"],
+}
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+# concatenate csr slices [starts[i], ends[i]) of values without a python loop
+def _gather(values, starts, ends):
+    lengths = ends - starts
+    total = int(lengths.sum())
+    offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return values[offsets + np.arange(total)]
+
+
+class FieldIndex:
+
+    # two-level inverted index for one column: token -> distinct values containing it,
+    # and distinct value -> row positions, so repeated values are tokenised only once
+    def __init__(self, series, chunk_size=100_000):
+        codes, self.values = pd.factorize(series.astype(object), use_na_sentinel=True)
+        self.values = np.asarray(self.values, dtype=object)
+
+        # distinct value -> rows (csr over row positions grouped by value)
+        rows = np.flatnonzero(codes >= 0)
+        order = np.argsort(codes[rows], kind="stable")
+        self.value_rows = rows[order]
+        self.value_ptr = np.searchsorted(codes[rows][order], np.arange(len(self.values) + 1))
+
+        # token -> distinct values (csr over value ids grouped by token), tokenised chunk_size
+        # values at a time so the exploded tokens of a large text column never sit in memory
+        # at once; each chunk keeps its unique (chunk token code, value) pairs
+        n_values = max(len(self.values), 1)
+        chunk_vocabs, chunk_pairs = [], []
+        for start in range(0, n_values, chunk_size):
+            tokens = (
+                pd.Series(self.values[start:start + chunk_size], dtype=object)
+                .str.lower()
+                .str.findall(TOKEN_PATTERN)
+                .explode()
+                .dropna()
+            )
+            token_codes, vocab = pd.factorize(tokens.to_numpy())
+            chunk_vocabs.append(np.asarray(vocab, dtype=object))
+            chunk_pairs.append(np.unique(token_codes.astype(np.int64) * n_values + start + tokens.index.to_numpy()))
+
+        # chunk vocabularies merged into one sorted vocabulary, chunk codes mapped onto it
+        vocab_codes, vocab = pd.factorize(np.concatenate(chunk_vocabs), sort=True)
+        self.vocab = pd.Series(np.asarray(vocab, dtype=object))
+        offset = 0
+        for i, chunk in enumerate(chunk_pairs):
+            chunk_pairs[i] = vocab_codes[offset + chunk // n_values].astype(np.int64) * n_values + chunk % n_values
+            offset += len(chunk_vocabs[i])
+        pairs = np.concatenate(chunk_pairs)
+        del chunk_pairs
+
+        # (token, value) pairs sorted by token, then value (chunks hold disjoint values, so
+        # they are already unique)
+        pairs.sort()
+        self.token_values = pairs % n_values
+        self.token_ptr = np.searchsorted(pairs // n_values, np.arange(len(self.vocab) + 1))
+
+    # ids of distinct values containing the term as a case-insensitive substring
+    def _match_values(self, term):
+        parts = TOKEN_PATTERN.findall(term)
+
+        if not parts:
+            # nothing indexable (e.g. punctuation only), check the distinct values directly
+            found = pd.Series(self.values, dtype=object).str.contains(term, case=False, regex=False)
+            return np.flatnonzero(found.fillna(False).to_numpy())
+
+        candidates = None
+        for part in parts:
+            # a substring made of word characters always sits inside a single token
+            token_ids = np.flatnonzero(self.vocab.str.contains(part, regex=False).to_numpy())
+            value_ids = np.unique(_gather(self.token_values, self.token_ptr[token_ids], self.token_ptr[token_ids + 1]))
+            candidates = value_ids if candidates is None else np.intersect1d(candidates, value_ids, assume_unique=True)
+
+        # multi-part terms (e.g. "wi-fi" or "no sync") must still appear verbatim
+        if len(parts) > 1 or parts[0] != term:
+            found = pd.Series(self.values[candidates], dtype=object).str.contains(term, case=False, regex=False)
+            candidates = candidates[found.to_numpy()]
+
+        return candidates
+
+    # sorted row positions whose value contains the term
+    def search(self, term):
+        value_ids = self._match_values(term.lower())
+        return np.sort(_gather(self.value_rows, self.value_ptr[value_ids], self.value_ptr[value_ids + 1]))
+
+
+class SearchIndex:
+
+    # built once per dataset load over the free-text, label/outcome and engineer columns
+    def __init__(self, df):
+        self.fields = {col: FieldIndex(df[col]) for col in SEARCH_FIELDS if col in df.columns}
+        self.aliases = {alias: col for col, names in SEARCH_FIELDS.items() if col in self.fields for alias in names}
+
+    # split a query into (field or None, term) pairs; quotes keep phrases together
+    def parse(self, query):
+        try:
+            parts = shlex.split(query)
+        except ValueError:
+            parts = query.split()
+
+        terms = []
+        for part in parts:
+            field, sep, term = part.partition(":")
+            if sep and term and field.lower() in self.aliases:
+                terms.append((self.aliases[field.lower()], term))
+            else:
+                terms.append((None, part))
+        return terms
+
+    # row positions matching every term; unscoped terms may match any field
+    def search(self, query):
+        result = None
+        for field, term in self.parse(query):
+            if field is None:
+                hits = np.unique(np.concatenate([index.search(term) for index in self.fields.values()]))
+            else:
+                hits = self.fields[field].search(term)
+            result = hits if result is None else np.intersect1d(result, hits, assume_unique=True)
+
+        return result if result is not None else np.array([], dtype=np.int64)
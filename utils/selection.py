@@ -0,0 +1,30 @@
+import numpy as np
+
+
+class RowSelection:
+
+    # read-only selection over the shared cached dataset: the full frame plus sorted row
+    # positions, so views can narrow and page through rows without copying the frame
+    def __init__(self, df, positions):
+        self.df = df
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    # values of one column for the selected rows
+    def values(self, column):
+        return self.df[column].to_numpy()[self.positions]
+
+    # narrower selection keeping rows where mask (aligned with the selection) is true
+    def where(self, mask):
+        return RowSelection(self.df, self.positions[mask])
+
+    # narrower selection keeping rows whose position is also in the given sorted positions
+    def intersect(self, positions):
+        return RowSelection(self.df, np.intersect1d(self.positions, positions, assume_unique=True))
+
+    # materialise the given columns for the selected rows, optionally in a given row order
+    def take(self, columns, order=None):
+        positions = self.positions if order is None else self.positions[order]
+        return self.df.iloc[positions, self.df.columns.get_indexer(columns)]
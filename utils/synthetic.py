@@ -0,0 +1,283 @@
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.alignment import REFERENCES
+
+# synthetic call dataset with the exact csv layout the dashboard reads (utils/ingest.py and
+# utils/schema.py), for scale and stress testing without the real extract. Rows are made in
+# chunks and appended to the csv, so memory stays flat from 50k to 50M rows
+#
+# usage (from the repo root):
+#   python -m utils.synthetic --rows 1000000 --out data/synthetic_1m.csv
+#   python -m utils.synthetic --rows 50000000 --out data/synthetic_50m.csv --skew 1.5
+#   python -m utils.synthetic --rows 10000000 --out data/synthetic_10m.csv --distinct-texts 0.1
+
+# source csv columns, in source order
+COLUMNS = [
+    "label",
+    "other_label",
+    "long_reason",
+    "evidence",
+    "confidence",
+    "selected_outcome_cleaned",
+    "outcome_cost",
+    "outcome_ts",
+    "sc_call_next_7d_flag",
+    "sc_call_next_7d_days",
+    "bb_churn_next_30d",
+    "bb_churn_next_60d",
+    "call_date",
+    "engineer_reported_cause",
+    "engineer_reported_symptom",
+    "engineer_reported_action",
+    "first_csg_call_reason",
+]
+
+# labels in the order the views chart them; with skew > 0 earlier ones are more common
+LABELS = ["Wi-Fi Status", "Unreliable Wi-Fi", "Slow Wi-Fi", "Poor Coverage", "Other", "Unclear"]
+
+# free-text sub-labels for calls labelled "Other"
+OTHER_LABELS = ["Billing query", "Line fault", "Equipment return", "Moving home", "Email issue"]
+
+# outcomes offered on the call, each with (average cost in £, 7 day repeat rate, 30 day churn rate)
+OUTCOMES = {
+    "Hub Restart": (0.0, 0.24, 0.020),
+    "Wi-Fi Channel Change": (0.0, 0.20, 0.018),
+    "Move Hub Location": (0.0, 0.18, 0.016),
+    "Speed Test Guidance": (0.0, 0.22, 0.022),
+    "Line Test": (4.5, 0.15, 0.015),
+    "Wi-Fi Disc Sent": (35.0, 0.10, 0.012),
+    "Replacement Hub": (65.0, 0.08, 0.010),
+    "Engineer Visit": (120.0, 0.06, 0.009),
+    "Escalate to Tech Team": (18.0, 0.12, 0.025),
+    "No Action": (0.0, 0.30, 0.035),
+}
+
+# reference values; the ones in a reference's agreed mapping (utils/alignment.py) are
+# always included so the label evaluation alignment has something to match
+ENGINEER_SYMPTOMS = list(REFERENCES["engineer_reported_symptom"]["mapping"]) + [
+    "TT Broadband - Intermittent Service",
+    "TT Broadband - Noisy Line",
+    "TT Broadband - No Dial Tone",
+]
+ENGINEER_CAUSES = [
+    "Faulty Hub", "Internal Wiring", "External Line Fault", "Customer Equipment",
+    "Exchange Fault", "No Fault Found",
+]
+ENGINEER_ACTIONS = [
+    "Hub Replaced", "Line Repaired", "Internal Wiring Fixed", "Advice Given", "Referred to Network",
+]
+CSG_REASONS = list(REFERENCES["first_csg_call_reason"]["mapping"]) + [
+    "Billing Query", "Equipment Query", "Other",
+]
+
+# words behind the free text: shared call vocabulary plus words typical of each label
+VOCABULARY = (
+    "customer hub router broadband connection wifi signal engineer line light sync speed "
+    "device devices laptop phone tv room house upstairs downstairs restart reboot reset "
+    "checked advised tested confirmed reported says said still again since yesterday week "
+    "working not drops dropping slow fast lights flashing orange blue white green red cable "
+    "socket master filter extender disc booster app test results mbps evening morning"
+).split()
+LABEL_WORDS = {
+    "Wi-Fi Status": "no internet offline lights orange sync lost connection down".split(),
+    "Unreliable Wi-Fi": "drops intermittent dropping disconnects unstable keeps cutting out".split(),
+    "Slow Wi-Fi": "slow speed buffering mbps speed test download upload lag".split(),
+    "Poor Coverage": "coverage upstairs room weak signal far extender disc bars".split(),
+    "Other": "billing account email move bill contract payment".split(),
+    "Unclear": "unsure call ended unclear customer hung up transferred".split(),
+}
+
+# words per text: log-normal (median, sigma), clipped to (min, max)
+TEXT_LENGTHS = {
+    "long_reason": (45, 0.45, 8, 250),
+    "evidence": (18, 0.55, 3, 120),
+}
+
+
+# probabilities falling off with rank (zipf-like): skew 0 is uniform, larger is more skewed
+def skewed_weights(n, skew):
+    weights = 1.0 / np.arange(1, n + 1) ** skew
+    return weights / weights.sum()
+
+
+# every word of the vocabularies in each spelling a text uses, at word id * 8 + flags:
+# capitalised (1, sentence start), full stop (2, sentence end) and text end (4, a newline
+# the joined texts are split at)
+WORDS = sorted(set(VOCABULARY).union(*LABEL_WORDS.values()))
+SPELLINGS = np.array([
+    (word.capitalize() if flags & 1 else word) + ("." if flags & 2 else "") + ("\n" if flags & 4 else "")
+    for word in WORDS for flags in range(8)
+], dtype=object)
+VOCABULARY_IDS = np.array([WORDS.index(word) for word in VOCABULARY])
+LABEL_WORD_IDS = {label: np.array([WORDS.index(word) for word in words]) for label, words in LABEL_WORDS.items()}
+
+
+# texts for one label, one per length: sentences of 6-14 random words, roughly one in five
+# drawn from the words typical of the label
+def _texts(rng, lengths, label):
+    n_words = lengths.sum()
+    word_ids = rng.choice(VOCABULARY_IDS, n_words)
+    from_label = rng.random(n_words) < 0.2
+    word_ids[from_label] = rng.choice(LABEL_WORD_IDS[label], from_label.sum())
+
+    # full stop after every sentence and at the end of each text
+    ends = np.cumsum(lengths)
+    sentence_end = np.zeros(n_words, dtype=bool)
+    sentence_end[np.cumsum(rng.integers(6, 15, n_words // 6 + 1))[:-1].clip(max=n_words - 1)] = True
+    sentence_end[ends - 1] = True
+    text_end = np.zeros(n_words, dtype=bool)
+    text_end[ends - 1] = True
+
+    # words are picked as ready-made spellings and joined once, then split into texts, so no
+    # python work runs per word
+    spellings = SPELLINGS[word_ids * 8 + np.roll(sentence_end, 1) * 1 + sentence_end * 2 + text_end * 4]
+    return np.array(" ".join(spellings)[:-1].split("\n "), dtype=object)
+
+
+# free text for each row of one text column. Every label gets a pool of new texts, about
+# distinct x its rows, each used by the same number of rows (distinct=1: every row its own
+# text), so distinct texts grow with the dataset as real call notes do
+def row_texts(rng, column, label_codes, distinct=1.0):
+    median, sigma, low, high = TEXT_LENGTHS[column]
+    texts = np.empty(len(label_codes), dtype=object)
+    for code, label in enumerate(LABELS):
+        rows = np.flatnonzero(label_codes == code)
+        if not len(rows):
+            continue
+        n_texts = max(1, int(np.ceil(len(rows) * distinct)))
+        lengths = np.clip(rng.lognormal(np.log(median), sigma, n_texts).round(), low, high).astype(np.int64)
+        texts[rows] = _texts(rng, lengths, label)[rng.permutation(len(rows)) % n_texts]
+    return texts
+
+
+# codes into values, with a chance of agreeing with the row's label through the
+# reference's mapping (-1 = no reference value, missing in the csv)
+def _reference_codes(rng, label_codes, values, mapping, present_rate, agreement, skew):
+    n = len(label_codes)
+    codes = rng.choice(len(values), n, p=skewed_weights(len(values), skew))
+
+    # value agreeing with each label, if the mapping has one
+    agreeing = np.full(len(LABELS), -1)
+    for value, label in mapping.items():
+        agreeing[LABELS.index(label)] = values.index(value)
+    agree = (rng.random(n) < agreement) & (agreeing[label_codes] >= 0)
+    codes = np.where(agree, agreeing[label_codes], codes)
+
+    return np.where(rng.random(n) < present_rate, codes, -1)
+
+
+def generate_chunk(rng, n, skew=1.0, agreement=0.6, distinct_texts=1.0, start_date="2025-08-01", end_date="2025-11-30"):
+    label_codes = rng.choice(len(LABELS), n, p=skewed_weights(len(LABELS), skew))
+    outcome_codes = rng.choice(len(OUTCOMES), n, p=skewed_weights(len(OUTCOMES), skew))
+    costs, repeat_rates, churn_rates = (np.array(x) for x in zip(*OUTCOMES.values()))
+
+    # calls are busier on weekdays
+    days = pd.date_range(start_date, end_date).to_numpy().astype("datetime64[D]")
+    day_weights = np.where(pd.DatetimeIndex(days).dayofweek < 5, 1.3, 1.0)
+    call_days = rng.choice(days, n, p=day_weights / day_weights.sum())
+    outcome_ts = call_days + rng.integers(8 * 3600, 20 * 3600, n).astype("timedelta64[s]")
+
+    # confidence scores lean high, with a few calls unscored
+    confidence = rng.choice(np.arange(1, 11), n, p=np.arange(1, 11) ** 1.5 / (np.arange(1, 11) ** 1.5).sum())
+    confidence = np.where(rng.random(n) < 0.02, np.nan, confidence)
+
+    # outcome cost around the outcome's average, sometimes missing
+    cost = np.where(costs[outcome_codes] > 0, rng.gamma(4.0, costs[outcome_codes] / 4.0), 0.0).round(2)
+    cost = np.where(rng.random(n) < 0.05, np.nan, cost)
+
+    # repeat and churn behaviour by outcome (unclear calls repeat more); 60 day churn
+    # includes 30 day churn
+    repeat = rng.random(n) < repeat_rates[outcome_codes] * np.where(label_codes == LABELS.index("Unclear"), 1.5, 1.0)
+    churn_30d = rng.random(n) < churn_rates[outcome_codes]
+    churn_60d = churn_30d | (rng.random(n) < churn_rates[outcome_codes] * 0.6)
+
+    # engineer columns are filled for calls followed by a visit
+    visited = rng.random(n) < 0.3
+    symptoms = _reference_codes(
+        rng, label_codes, ENGINEER_SYMPTOMS, REFERENCES["engineer_reported_symptom"]["mapping"], 1.0, agreement, skew
+    )
+    causes = rng.choice(len(ENGINEER_CAUSES), n, p=skewed_weights(len(ENGINEER_CAUSES), skew))
+    actions = rng.choice(len(ENGINEER_ACTIONS), n, p=skewed_weights(len(ENGINEER_ACTIONS), skew))
+    csg_reasons = _reference_codes(
+        rng, label_codes, CSG_REASONS, REFERENCES["first_csg_call_reason"]["mapping"], 0.6, agreement, skew
+    )
+
+    is_other = label_codes == LABELS.index("Other")
+
+    return pd.DataFrame({
+        "label": pd.Categorical.from_codes(label_codes, categories=LABELS),
+        "other_label": pd.Categorical.from_codes(
+            np.where(is_other, rng.integers(0, len(OTHER_LABELS), n), -1), categories=OTHER_LABELS
+        ),
+        "long_reason": row_texts(rng, "long_reason", label_codes, distinct_texts),
+        "evidence": row_texts(rng, "evidence", label_codes, distinct_texts),
+        "confidence": confidence,
+        "selected_outcome_cleaned": pd.Categorical.from_codes(outcome_codes, categories=list(OUTCOMES)),
+        "outcome_cost": cost,
+        "outcome_ts": outcome_ts,
+        "sc_call_next_7d_flag": repeat.astype(np.int8),
+        "sc_call_next_7d_days": np.where(repeat, rng.integers(1, 8, n), np.nan),
+        "bb_churn_next_30d": churn_30d.astype(np.int8),
+        "bb_churn_next_60d": churn_60d.astype(np.int8),
+        "call_date": np.datetime_as_string(call_days, unit="D"),
+        "engineer_reported_cause": pd.Categorical.from_codes(np.where(visited, causes, -1), categories=ENGINEER_CAUSES),
+        "engineer_reported_symptom": pd.Categorical.from_codes(np.where(visited, symptoms, -1), categories=ENGINEER_SYMPTOMS),
+        "engineer_reported_action": pd.Categorical.from_codes(np.where(visited, actions, -1), categories=ENGINEER_ACTIONS),
+        "first_csg_call_reason": pd.Categorical.from_codes(csg_reasons, categories=CSG_REASONS),
+    })[COLUMNS]
+
+
+# write rows to a csv chunk by chunk (each chunk from its own seeded stream, so the output
+# only depends on the seed and chunk size); progress, if given, is called with the rows
+# written so far after each chunk
+def write_csv(path, rows, chunk_size=500_000, seed=0, progress=None, **params):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    seeds = np.random.SeedSequence(seed).spawn(-(-rows // chunk_size))
+
+    # write to a temp file first so an interrupted run never leaves a partial dataset behind
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    written = 0
+    for i, chunk_seed in enumerate(seeds):
+        n = min(chunk_size, rows - written)
+        chunk = generate_chunk(np.random.default_rng(chunk_seed), n, **params)
+        chunk.to_csv(tmp_path, mode="w" if i == 0 else "a", header=i == 0, index=False, date_format="%Y-%m-%d %H:%M:%S")
+        written += n
+        if progress is not None:
+            progress(written)
+
+    tmp_path.replace(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic call dataset in the dashboard's csv layout")
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--out", default="data/synthetic_calls.csv")
+    parser.add_argument("--skew", type=float, default=1.0, help="zipf exponent for label, outcome and reason mixes (0 = uniform)")
+    parser.add_argument("--agreement", type=float, default=0.6, help="chance a reference value agrees with the label through its mapping")
+    parser.add_argument("--start-date", default="2025-08-01")
+    parser.add_argument("--end-date", default="2025-11-30")
+    parser.add_argument("--chunk-size", type=int, default=500_000)
+    parser.add_argument("--distinct-texts", type=float, default=1.0, help="distinct texts per row in each text column (1 = every row its own text)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    write_csv(
+        args.out, args.rows, args.chunk_size, args.seed,
+        progress=lambda written: print(f"{written:,} / {args.rows:,} rows ({time.perf_counter() - start:,.0f} s)"),
+        skew=args.skew, agreement=args.agreement, distinct_texts=args.distinct_texts,
+        start_date=args.start_date, end_date=args.end_date
+    )
+
+    print(f"wrote {args.out} ({Path(args.out).stat().st_size / 1e9:.2f} GB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import datetime as dt
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from utils.profiling import span
+
+# background warm-up at server start: computes every view's results for the default filter
+# state and a list of common presets into the shared result cache (and its disk store), so
+# the first visitor to each view hits the cache like everyone after them
+logger = logging.getLogger(__name__)
+
+# presets file: a json list of filter states, each with an optional "name" and any of
+# "labels", "outcomes", "start_date" and "end_date" (iso dates); missing keys keep their
+# default (all labels / outcomes, full date range)
+PRESETS_PATH = os.environ.get("DASHBOARD_WARMUP_PRESETS", "warmup_presets.json")
+
+# filter keys in filter_state_key order
+FILTER_KEYS = ["labels", "outcomes", "start_date", "end_date"]
+
+
+# presets from the json file (none when it does not exist)
+def load_presets(path=PRESETS_PATH):
+    path = Path(path)
+    if not path.exists():
+        return []
+
+    presets = json.loads(path.read_text())
+    for i, preset in enumerate(presets):
+        unknown = set(preset) - set(FILTER_KEYS) - {"name"}
+        if unknown:
+            raise ValueError(f"{path} preset {i}: unknown keys {sorted(unknown)}")
+    return presets
+
+
+# (name, filter state) for the default state and each preset, with dates as date objects
+# like the sidebar's, skipping duplicates
+def filter_states(default, presets):
+    states = [("default", default)]
+    for i, preset in enumerate(presets):
+        state = dict(default)
+        for key in FILTER_KEYS:
+            if key in preset:
+                value = preset[key]
+                state[key] = dt.date.fromisoformat(value) if key.endswith("_date") else list(value)
+        if state not in [s for _, s in states]:
+            states.append((preset.get("name", f"preset {i + 1}"), state))
+    return states
+
+
+class WarmUp:
+
+    # daemon thread running (name, task) pairs in turn; a failing task is logged and skipped,
+    # and progress is kept for the admin page
+    def __init__(self, tasks):
+        self.tasks = tasks
+        self.results = []   # (name, seconds, error or None)
+        self.started = self.finished = None
+        self._thread = threading.Thread(target=self._run, name="dashboard-warm-up", daemon=True)
+
+    def start(self):
+        self.started = time.time()
+        self._thread.start()
+        return self
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    def _run(self):
+        for name, task in self.tasks:
+            start = time.perf_counter()
+            error = None
+            try:
+                with span(f"warmup.{name}"):
+                    task()
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                logger.exception("warm-up of %s failed", name)
+            self.results.append((name, time.perf_counter() - start, error))
+        self.finished = time.time()
@@ -0,0 +1,261 @@
+import time
+
+import streamlit as st
+import pandas as pd
+
+from utils.memory import process_rss, frame_memory, deep_size, live_session_states
+from utils.result_cache import result_cache
+from utils.profiling import section, span
+from views.label_evaluation import COLUMNS as label_evaluation_columns
+
+# filter keys read from each session's state
+FILTER_KEYS = ["selected_labels", "selected_outcomes", "start_date", "end_date"]
+
+# bytes per filtered row a session holds while its view reruns: resolved row positions
+# (int64), plus the label evaluation columns taken for those rows, or the raw data sort
+# order; overview and outcome analysis read shared cached aggregates only
+POSITION_BYTES = 8
+ORDER_BYTES = 8
+
+
+# bytes to megabytes for the tables and cards
+def mb(n):
+    return n / 1e6
+
+
+def render_view(df_label, filter_index, shared, lazy, warm_up=None):
+
+    # page text
+    st.write("\n\n")
+    st.markdown(
+        '<span style="font-size: 1.1rem; font-weight: 400;">Memory held by this dashboard server: the shared dataset, indexes and caches, and what each live session adds on top</span>',
+        unsafe_allow_html=True
+    )
+    st.divider()
+
+
+    ##################################
+    ### section 1 - process memory ###
+    ##################################
+
+    @section("admin.process")
+    def process(shared, lazy):
+        st.subheader("Process Memory")
+        st.write("\n\n")
+
+        # lazily loaded resources are built on first use by their view, so sizing them here
+        # loads them if no session has yet
+        include_lazy = st.toggle(
+            "Include lazily loaded resources",
+            key="admin_include_lazy",
+            help="Size the alignment engine, text columns and search index too (loads them if no view has yet)."
+        )
+
+        resources = dict(shared)
+        if include_lazy:
+            resources.update({name: load() for name, load in lazy.items()})
+
+        # one seen set across resources, so frames and arrays shared between them count once
+        seen = set()
+        with span("admin.deep_size"):
+            sizes = pd.DataFrame(
+                [(name, deep_size(obj, seen)) for name, obj in resources.items()],
+                columns=["resource", "bytes"]
+            )
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Resident memory", f"{mb(process_rss()):,.0f} MB")
+        col2.metric("Shared resources", f"{mb(sizes['bytes'].sum()):,.0f} MB")
+        col3.metric("Dataset rows", f"{len(df_label):,}")
+
+        st.write("\n\n")
+        with span("table"):
+            st.dataframe(
+                sizes.assign(MB=mb(sizes["bytes"]))[["resource", "MB"]],
+                width='stretch',
+                hide_index=True,
+                column_config={"MB": st.column_config.NumberColumn(format="%.1f")}
+            )
+        st.caption("Deep sizes of the cache_resource objects shared by every session; buffers shared between them are counted once")
+
+    process(shared, lazy)
+
+    st.divider()
+
+
+    ###################################
+    ### section 2 - dataset columns ###
+    ###################################
+
+    @section("admin.dataset_columns")
+    def dataset_columns(df_label):
+        st.subheader("Dataset Memory by Column")
+        st.write("\n\n")
+
+        with span("admin.frame_memory"):
+            columns = frame_memory(df_label)
+
+        with span("table"):
+            st.dataframe(
+                columns.assign(MB=mb(columns["bytes"]), bytes_per_row=columns["bytes"] / max(len(df_label), 1))
+                [["column", "dtype", "MB", "bytes_per_row", "pct"]],
+                width='stretch',
+                hide_index=True,
+                column_config={
+                    "MB": st.column_config.NumberColumn(format="%.2f"),
+                    "bytes_per_row": st.column_config.NumberColumn("Bytes per row", format="%.1f"),
+                    "pct": st.column_config.ProgressColumn("% of dataset", format="%.1f%%", min_value=0, max_value=100),
+                }
+            )
+        st.caption(f"Deep memory of the loaded dataset: {mb(columns['bytes'].sum()):,.1f} MB in {len(columns)} columns (strings counted by their full size)")
+
+    dataset_columns(df_label)
+
+    st.divider()
+
+
+    ################################
+    ### section 3 - result cache ###
+    ################################
+
+    @section("admin.result_cache")
+    def result_cache_usage(warm_up):
+        st.subheader("Cached Results")
+        st.write("\n\n")
+
+        cache = result_cache()
+        stats = cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Entries", f"{stats['entries']:,} / {cache.max_entries:,}")
+        col2.metric("Size", f"{mb(stats['bytes']):,.1f} / {mb(cache.max_bytes):,.0f} MB")
+        col3.metric("Hit rate", f"{stats['hits'] / lookups:.1%}" if lookups else "–")
+        col4.metric("Evicted / expired", f"{stats['evictions']:,} / {stats['expirations']:,}")
+
+        # tables also kept on disk across restarts, for the current source content only
+        if cache.store is not None:
+            store = cache.store.stats()
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("On disk", f"{store['entries']:,} tables")
+            col2.metric("Disk size", f"{mb(store['bytes']):,.1f} / {mb(cache.store.max_bytes):,.0f} MB")
+            col3.metric("Loaded from disk", f"{store['loads']:,}")
+            col4.metric("Written / evicted", f"{store['saves']:,} / {store['evictions']:,}")
+
+        # startup warm-up of the default filters and presets (see utils/warmup.py)
+        if warm_up is not None:
+            done = len(warm_up.results)
+            elapsed = (warm_up.finished or time.time()) - warm_up.started
+            st.caption(
+                f"Warm-up {'running' if warm_up.running else 'finished'}: {done} of {len(warm_up.tasks)} tasks "
+                f"in {elapsed:,.1f} s ({', '.join(f'{name} {seconds:,.1f} s' for name, seconds, _ in warm_up.results)})"
+            )
+            for name, _, error in warm_up.results:
+                if error:
+                    st.warning(f"Warm-up of {name} failed: {error}")
+        else:
+            st.caption("Warm-up is off (DASHBOARD_WARMUP=0)")
+
+        entries = cache.entries()
+        if entries.empty:
+            st.info("No cached results yet: open a filtered view to populate them.")
+            return
+
+        per_namespace = (
+            entries.groupby("namespace")
+            .agg(entries=("bytes", "size"), total=("bytes", "sum"), largest=("bytes", "max"), oldest_s=("age_s", "max"))
+            .sort_values("total", ascending=False)
+            .reset_index()
+        )
+
+        st.write("\n\n")
+        with span("table"):
+            st.dataframe(
+                per_namespace.assign(
+                    total_mb=mb(per_namespace["total"]),
+                    avg_kb=per_namespace["total"] / per_namespace["entries"] / 1e3,
+                    largest_kb=per_namespace["largest"] / 1e3,
+                )[["namespace", "entries", "total_mb", "avg_kb", "largest_kb", "oldest_s"]],
+                width='stretch',
+                hide_index=True,
+                column_config={
+                    "total_mb": st.column_config.NumberColumn("Total MB", format="%.2f"),
+                    "avg_kb": st.column_config.NumberColumn("Avg KB per entry", format="%.1f"),
+                    "largest_kb": st.column_config.NumberColumn("Largest KB", format="%.1f"),
+                    "oldest_s": st.column_config.NumberColumn("Oldest (s)", format="%.0f"),
+                }
+            )
+        st.caption(f"Filter-dependent results shared by all sessions, least recently used evicted first, each kept at most {cache.ttl:,.0f} s")
+
+        if st.button("Clear cached results", help="Empties the in-memory cache; tables on disk are kept"):
+            cache.clear()
+            st.rerun()
+
+    result_cache_usage(warm_up)
+
+    st.divider()
+
+
+    ############################
+    ### section 4 - sessions ###
+    ############################
+
+    @section("admin.sessions")
+    def sessions(df_label, filter_index):
+        st.subheader("Sessions")
+        st.write("\n\n")
+
+        states = live_session_states()
+        if states is None:
+            # outside a running server, or when its sessions can't be read, only this
+            # session's state is visible
+            states = {"this session": dict(st.session_state)}
+            st.caption("Live sessions unavailable (no streamlit server, or its session manager changed): showing this session only")
+
+        # bytes per filtered row of the columns the label evaluation view takes
+        taken = frame_memory(df_label[[c for c in label_evaluation_columns if c in df_label.columns]])
+        per_row = {
+            "Label Evaluation": POSITION_BYTES + taken["bytes"].sum() / max(len(df_label), 1),
+            "Raw Label Data": POSITION_BYTES + ORDER_BYTES,
+        }
+
+        rows = []
+        for session_id, state in states.items():
+            view = state.get("selected_view")
+            n_rows = None
+            if all(key in state for key in FILTER_KEYS):
+                n_rows = filter_index.count(*(state[key] for key in FILTER_KEYS))
+            rows.append({
+                "session": str(session_id).split("-")[0],
+                "view": view,
+                "filtered_rows": n_rows,
+                "state_kb": deep_size(state) / 1e3,
+                "in_flight_mb": mb((n_rows or 0) * per_row.get(view, 0)),
+            })
+        table = pd.DataFrame(rows, columns=["session", "view", "filtered_rows", "state_kb", "in_flight_mb"])
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Live sessions", f"{len(table):,}")
+        col2.metric("Avg session state", f"{table['state_kb'].mean():,.1f} KB")
+        col3.metric("Avg in-flight memory", f"{table['in_flight_mb'].mean():,.2f} MB")
+
+        st.write("\n\n")
+        with span("table"):
+            st.dataframe(
+                table.sort_values("in_flight_mb", ascending=False),
+                width='stretch',
+                hide_index=True,
+                column_config={
+                    "filtered_rows": st.column_config.NumberColumn("Filtered rows", format="%d"),
+                    "state_kb": st.column_config.NumberColumn("Session state KB", format="%.1f"),
+                    "in_flight_mb": st.column_config.NumberColumn("In-flight MB (est.)", format="%.2f"),
+                }
+            )
+        st.caption(
+            "Session state is sized deeply per session. In-flight memory is estimated from each session's "
+            "filters: row positions plus the columns its view takes for the filtered rows while it reruns"
+        )
+
+    sessions(df_label, filter_index)
+
+    st.divider()
@@ -2,113 +2,153 @@ import streamlit as st
 import pandas as pd
 import altair as alt
 
-def render_view(df_filtered):
+from utils.alignment import LABEL, REFERENCES, alignment_by_confidence, ranked_distribution
+from utils.compute import confidence_distribution, reference_label_totals, reference_mix_table
+from utils.result_cache import cached_result
+from utils.profiling import section, span
+
+# columns this view reads from the filtered data (reference columns come from the cached
+# alignment counts)
+COLUMNS = [
+    "confidence"
+]
+
+# label order for the reason distribution charts
+LABEL_ORDER = [
+    "Wi-Fi Status",
+    "Unreliable Wi-Fi",
+    "Slow Wi-Fi",
+    "Poor Coverage",
+    "Other",
+    "Unclear"
+]
+
+# top x reference values shown per label by default, and the references with a reason
+# distribution and an alignment section (sections 1-4)
+DEFAULT_TOP_X = 5
+SECTION_REFERENCES = ["engineer_reported_symptom", "first_csg_call_reason"]
+
+# calls per label with a reference value (with the "label (n.nk)" axis titles), and the top x
+# values per label with those totals merged in for the chart
+def reason_tables(confusion, reference, state_key, top_x, other_bucket):
+    label_totals = cached_result(
+        "label_evaluation.reference_label_totals",
+        state_key,
+        lambda: reference_label_totals(confusion),
+        persist=True, reference=reference
+    )
+    reason_counts = cached_result(
+        "label_evaluation.reason_distribution",
+        state_key,
+        lambda: ranked_distribution(
+            confusion, reference, top_x, other_bucket="Everything else" if other_bucket else None
+        ).merge(
+            label_totals[["label", "label_with_total"]],
+            on="label",
+            how="left"
+        ),
+        reference=reference, top_x=top_x, other_bucket=other_bucket
+    )
+    return label_totals, reason_counts
+
+# alignment at every confidence threshold for one reference
+def alignment_table(confusion, reference, state_key):
+    return cached_result(
+        "label_evaluation.alignment_by_confidence",
+        state_key,
+        lambda: alignment_by_confidence(confusion),
+        persist=True, reference=reference
+    )
 
-    # page text
-    st.write("\n\n")
-    st.markdown(
-    '<span style="font-size: 1.1rem; font-weight: 400;">Evaluate the accuracy of LLM-generated labels by comparing them against Enginner notes and CSG call reasons</span>',
-    unsafe_allow_html=True
+# long label x reference value table as % of each label's calls
+def mix_table(confusion, reference, state_key):
+    return cached_result(
+        "label_evaluation.reference_mix_table",
+        state_key,
+        lambda: reference_mix_table(confusion),
+        persist=True, reference=reference
     )
-    st.divider()
 
-    # work on a copy to avoid mutating the original dataframe
-    df_working = df_filtered.copy()
+# calls per confidence score bin
+def confidence_table(df_filtered, state_key):
+    return cached_result(
+        "label_evaluation.confidence_distribution",
+        state_key,
+        lambda: confidence_distribution(df_filtered["confidence"]),
+        persist=True
+    )
 
+# top x slider start value (no more than the reference values with calls)
+def default_top_x(confusion):
+    return min(DEFAULT_TOP_X, max(len(confusion.ranking), 1))
+
+# results of the default slider and selectbox settings, computed ahead of the first visit
+# (see utils/warmup.py)
+def warm_up(df_filtered, alignment, state_key):
+    for reference in SECTION_REFERENCES:
+        reason_tables(alignment[reference], reference, state_key, default_top_x(alignment[reference]), False)
+        alignment_table(alignment[reference], reference, state_key)
+    mix_table(alignment[list(REFERENCES)[0]], list(REFERENCES)[0], state_key)
+    confidence_table(df_filtered, state_key)
 
-    ##############################################
-    ### section 1 - engineer reasons per label ###
-    ##############################################
 
-    st.subheader("Engineer Reported Reasons by Label")
+# top x reference values per label, sliced from the cached counts and ranking
+@section("label_evaluation.{key}_reasons")
+def render_reason_distribution(confusion, reference, warning, slider_label, key, caption, state_key):
+    name = REFERENCES[reference]["name"]
+    short_name = REFERENCES[reference]["short_name"]
+
+    st.subheader(f"{name}s by Label")
     st.write("\n\n")
-    st.warning("Only calls that end in a BBTTE visit have engineer notes. Distributions are for calls with both values. Mapping below.")
+    st.warning(warning)
     st.write("\n\n")
 
-    # top x filter
-    filter_col, _ = st.columns([3, 7])
+    # nothing to chart when the filters leave no calls with a reference value
+    if not len(confusion.ranking):
+        st.info(f"No {name}s under the current filters.")
+        return
+
+    # top x filter (a slider needs at least two values to choose from)
+    filter_col, bucket_col, _ = st.columns([3, 2, 5])
     with filter_col:
-        # top X slider
-        top_x = st.slider(
-            "Show top X engineer reported reasons for each label:",
-            min_value=1,
-            max_value=len(df_working['engineer_reported_symptom'].dropna().value_counts()),
-            value=5,
-            key="eng_top_x"
+        if len(confusion.ranking) > 1:
+            top_x = st.slider(
+                slider_label,
+                min_value=1,
+                max_value=len(confusion.ranking),
+                value=default_top_x(confusion),
+                key=f"{key}_top_x"
+            )
+        else:
+            top_x = 1
+            st.info(f"Only one {name} under the current filters.")
+    with bucket_col:
+        other_bucket = st.toggle(
+            "Group the rest as \"Everything else\"",
+            value=False,
+            key=f"{key}_other_bucket"
         )
-
     st.write("\n\n")
 
-    # remove nulls for reason analysis
-    df_eng_reason = df_working[df_working["engineer_reported_symptom"].notna()].copy()
-
-    # get counts
-    eng_reason_counts = (
-        df_eng_reason.groupby(["label", "engineer_reported_symptom"])
-        .size()
-        .reset_index(name="count")
-    )
-
-    # totals for x-axis (only where reason exists)
-    eng_label_totals = (
-        df_eng_reason.groupby("label")
-        .size()
-        .reset_index(name="total_calls")
-    )
-
-    # add totals to labels
-    eng_label_totals["label_with_total"] = (
-        eng_label_totals["label"] + " (" + (eng_label_totals["total_calls"] / 1000).round(1).astype(str) + "k)"
-    )
-
-    # calculate percent within label (based on full label denominator)
-    eng_reason_counts = eng_reason_counts.merge(eng_label_totals[["label", "total_calls"]], on="label", how="left")
-    eng_reason_counts["pct_of_label"] = eng_reason_counts["count"] / eng_reason_counts["total_calls"] * 100
-
-    # label order
-    label_order = [
-        "Wi-Fi Status",
-        "Unreliable Wi-Fi",
-        "Slow Wi-Fi",
-        "Poor Coverage",
-        "Other",
-        "Unclear"
-    ]
-
-    # determine top X reasons by overall count
-    eng_top_reasons = (
-        eng_reason_counts.groupby("engineer_reported_symptom")["count"]
-        .sum()
-        .reset_index()
-        .sort_values("count", ascending=False)
-        .head(top_x)["engineer_reported_symptom"]
-    )
-
-    # filter to only top reasons (no "Other" bucket)
-    eng_reason_counts = eng_reason_counts[eng_reason_counts["engineer_reported_symptom"].isin(eng_top_reasons)].copy()
-
-    # merge totals into chart df
-    eng_reason_counts = eng_reason_counts.merge(
-        eng_label_totals[["label", "label_with_total"]],
-        on="label",
-        how="left"
-    )
+    # totals for x-axis (only where reason exists), with totals added to labels, and the
+    # counts only (the ranking was computed once for the filter state)
+    label_totals, reason_counts = reason_tables(confusion, reference, state_key, top_x, other_bucket)
 
     # build chart
-    eng_reason_chart = (
-        alt.Chart(eng_reason_counts)
+    reason_chart = (
+        alt.Chart(reason_counts)
         .mark_bar()
         .encode(
             x=alt.X(
                 "label_with_total:N",
                 title="Label (Total Calls)",
                 sort=alt.SortArray(
-                    eng_label_totals[
-                        eng_label_totals["label"].isin(label_order)
+                    label_totals[
+                        label_totals["label"].isin(LABEL_ORDER)
                     ]
                     .assign(
                         label_order=lambda df: df["label"].map(
-                            {label: i for i, label in enumerate(label_order)}
+                            {label: i for i, label in enumerate(LABEL_ORDER)}
                         )
                     )
                     .sort_values(by="label_order")["label_with_total"]
@@ -117,10 +157,10 @@ def render_view(df_filtered):
                 axis=alt.Axis(labelAngle=0, labelLimit=1000)
             ),
             y=alt.Y("pct_of_label:Q", title="% of Label Calls", scale=alt.Scale(domain=[0, 100])),
-            color=alt.Color("engineer_reported_symptom:N", title="Engineer Reason"),
+            color=alt.Color(f"{reference}:N", title=short_name),
             tooltip=[
                 alt.Tooltip("label:N", title="Label"),
-                alt.Tooltip("engineer_reported_symptom:N", title="Engineer Reason"),
+                alt.Tooltip(f"{reference}:N", title=short_name),
                 alt.Tooltip("pct_of_label:Q", title="% of Label", format=".1f"),
                 alt.Tooltip("count:Q", title="Count")
             ]
@@ -128,83 +168,56 @@ def render_view(df_filtered):
         .properties(height=350)
     )
 
-    st.altair_chart(eng_reason_chart, width='stretch')
+    with span("chart"):
+        st.altair_chart(reason_chart, width='stretch')
 
     # remaining rows after filtering
-    st.caption(f"{eng_label_totals.total_calls.sum():,} or {round(eng_label_totals.total_calls.sum() / len(df_filtered) * 100, 1)}% calls with a BTTEE visit and engineer note  after global filters applied")
-
-    st.divider()
+    total_calls = label_totals.total_calls.sum()
+    filtered_calls = confusion.counts.sum()
+    st.caption(f"{total_calls:,} or {round(total_calls / filtered_calls * 100, 1)}% {caption}")
 
 
-    #############################################
-    ### section 2 - engineer reason alignment ###
-    #############################################
+# alignment of labels with one mapped reference column, with its own confidence slider
+@section("label_evaluation.{key}_alignment")
+def render_alignment(confusion, reference, key, state_key):
+    name = REFERENCES[reference]["name"]
+    short_name = REFERENCES[reference]["short_name"]
+    mapping = REFERENCES[reference]["mapping"]
 
-    st.subheader("Engineer Reported Reason Alignment by Label")
+    st.subheader(f"{name} Alignment by Label")
     st.write("\n\n")
-    st.warning("Alignment is calculated only for calls with a mapped engineer reported reason. Mapping below.")
+    st.warning(f"Alignment is calculated only for calls with a mapped {name}. Mapping below.")
     st.write("\n\n")
 
     # confidence filter
-    # filter_col, _ = st.columns([3, 7])
-    # with filter_col:
     with st.expander("Confidence filtering", expanded=False):
-        engineer_min_confidence = st.slider(
+        min_confidence = st.slider(
             "Minimum LLM-derived confidence score:",
             min_value=1,
             max_value=10,
             value=1,
-            key="engineer_alignment_confidence"
+            key=f"{key}_alignment_confidence"
         )
 
-    # mapping dictionary
-    eng_to_llm_map = {
-        "TT Broadband - No Sync": "Wi-Fi Status",
-        "TT Broadband -  Connection Dropping out": "Unreliable Wi-Fi",  # has extra space
-        "TT Broadband - Slow Speed": "Slow Wi-Fi",
-    }
-
-    df_working["mapped_llm_label_eng"] = df_working["engineer_reported_symptom"].map(eng_to_llm_map)
-
-    # compute alignment based on non-null engineer reasons and confidence filter
-    alignment_base = df_working[
-        (df_working["engineer_reported_symptom"].notna()) &
-        (df_working["confidence"] >= engineer_min_confidence)
-    ].copy()
-
-    mapped_counts = (
-        alignment_base.dropna(subset=["mapped_llm_label_eng"])
-        .groupby(["label", "mapped_llm_label_eng"])
-        .size()
-        .reset_index(name="mapped_count")
-    )
+    # alignment at every confidence threshold from the cached counts; the slider picks one threshold
+    alignment = alignment_table(confusion, reference, state_key)
+    alignment_total = alignment["total"].set_index("min_confidence")
 
-    label_totals_reason = (
-        alignment_base.groupby("label")
-        .size()
-        .reset_index(name="label_reason_count")
-    )
-
-    if alignment_base.shape[0] < 50:
+    if alignment_total.loc[min_confidence, "calls"] < 50:
         st.warning("Low sample size — interpret alignment with caution.")
 
-    alignment_df = mapped_counts.merge(label_totals_reason, on="label", how="left")
-
-    # compute alignment correctly (only matching labels)
-    alignment_df["match_flag"] = alignment_df["label"] == alignment_df["mapped_llm_label_eng"]
-    alignment_df["match_count"] = alignment_df["mapped_count"] * alignment_df["match_flag"]
-
     alignment_df = (
-        alignment_df.groupby("label")
-        .agg(
-            mapped_count=("mapped_count", "sum"),
-            match_count=("match_count", "sum"),
-            label_reason_count=("label_reason_count", "first")
-        )
-        .reset_index()
+        alignment["label"][alignment["label"]["min_confidence"] == min_confidence]
+        .drop(columns="min_confidence")
+        .reset_index(drop=True)
     )
 
-    alignment_df["alignment_pct"] = (alignment_df["match_count"] / alignment_df["label_reason_count"]) * 100
+    tooltip = [
+        alt.Tooltip("label:N", title="Label"),
+        alt.Tooltip("label_reason_count:Q", title=f"Calls with {short_name}"),
+        alt.Tooltip("match_count:Q", title="Mapped Calls"),
+        alt.Tooltip("alignment_pct:Q", title="Alignment %", format=".1f")
+    ]
 
     alignment_chart = (
         alt.Chart(alignment_df)
@@ -212,239 +225,102 @@ def render_view(df_filtered):
         .encode(
             y=alt.Y("label:N", sort="-x", title=None),
             x=alt.X("alignment_pct:Q", title="Alignment (%)", scale=alt.Scale(domain=[0, 100])),
-            tooltip=[
-                alt.Tooltip("label:N", title="Label"),
-                alt.Tooltip("label_reason_count:Q", title="Calls with Engineer Reason"),
-                alt.Tooltip("match_count:Q", title="Mapped Calls"),
-                alt.Tooltip("alignment_pct:Q", title="Alignment %", format=".1f")
-            ]
+            tooltip=tooltip
         )
         .properties(height=45 * len(alignment_df))
     )
 
-    st.altair_chart(alignment_chart, width='stretch')
+    with span("chart"):
+        st.altair_chart(alignment_chart, width='stretch')
 
-    with st.expander("Label to Engineer Reported Reason mapping"):
-        label_to_eng_map = pd.DataFrame(
-            list(eng_to_llm_map.items()),
-            columns=["Engineer Reason", "Label"]
-        )
-        st.table(label_to_eng_map[["Label", "Engineer Reason"]])
+    # alignment against minimum confidence, from the same precomputed table
+    curve_base = alt.Chart(alignment["label"]).encode(
+        x=alt.X("min_confidence:O", title="Minimum Confidence", axis=alt.Axis(labelAngle=0)),
+        y=alt.Y("alignment_pct:Q", title="Alignment (%)", scale=alt.Scale(domain=[0, 100])),
+        color=alt.Color("label:N", title="Label"),
+        tooltip=tooltip[:1] + [alt.Tooltip("min_confidence:O", title="Minimum Confidence")] + tooltip[1:]
+    )
+    threshold_rule = (
+        alt.Chart(pd.DataFrame({"min_confidence": [min_confidence]}))
+        .mark_rule(color="grey", strokeDash=[4, 4])
+        .encode(x="min_confidence:O")
+    )
 
-    st.divider()
+    with st.expander("Alignment by minimum confidence", expanded=False):
+        with span("chart"):
+            st.altair_chart(
+                (curve_base.mark_line(point=True) + threshold_rule).properties(height=300),
+                width='stretch'
+            )
 
+    with st.expander(f"Label to {name} mapping"):
+        with span("table"):
+            st.table(pd.DataFrame(
+                [(label, value) for value, label in mapping.items()],
+                columns=["Label", short_name]
+            ))
 
-    #########################################
-    ### section 3 - csg reasons per label ###
-    #########################################
 
-    st.subheader("CSG Call Reasons by Label")
-    st.write("\n\n")
-    st.warning("Not all calls have a CSG reason. Distributions are for calls with both values.")
-    st.write("\n\n")
+def render_view(df_filtered, alignment, state_key):
 
-    # top X filter
-    filter_col, _ = st.columns([3, 7])
-    with filter_col:
-        top_x = st.slider(
-            "Top X CSG reasons ::",
-            min_value=1,
-            max_value=len(df_working['first_csg_call_reason'].dropna().value_counts()),
-            value=5
-        )
+    # page text
     st.write("\n\n")
-
-    # remove nulls for reason analysis
-    df_reason = df_working[df_working["first_csg_call_reason"].notna()].copy()
-
-    # get counts
-    reason_counts = (
-        df_reason.groupby(["label", "first_csg_call_reason"])
-        .size()
-        .reset_index(name="count")
-    )
-
-    # totals for x-axis (only where reason exists)
-    label_totals = (
-        df_reason.groupby("label")
-        .size()
-        .reset_index(name="total_calls")
-    )
-
-    # add totals to labels
-    label_totals["label_with_total"] = (
-        label_totals["label"] + " (" + (label_totals["total_calls"] / 1000).round(1).astype(str) + "k)"
+    st.markdown(
+    '<span style="font-size: 1.1rem; font-weight: 400;">Evaluate the accuracy of LLM-generated labels by comparing them against Enginner notes and CSG call reasons</span>',
+    unsafe_allow_html=True
     )
+    st.divider()
 
-    # calculate percent within label (based on full label denominator)
-    reason_counts = reason_counts.merge(label_totals[["label", "total_calls"]], on="label", how="left")
-    reason_counts["pct_of_label"] = reason_counts["count"] / reason_counts["total_calls"] * 100
-
-    # label order
-    label_order = [
-        "Wi-Fi Status",
-        "Unreliable Wi-Fi",
-        "Slow Wi-Fi",
-        "Poor Coverage",
-        "Other",
-        "Unclear"
-    ]
 
-    # determine top X reasons by overall count
-    top_reasons = (
-        reason_counts.groupby("first_csg_call_reason")["count"]
-        .sum()
-        .reset_index()
-        .sort_values("count", ascending=False)
-        .head(top_x)["first_csg_call_reason"]
-    )
 
-    # filter to only top reasons (no "Other" bucket)
-    reason_counts = reason_counts[reason_counts["first_csg_call_reason"].isin(top_reasons)].copy()
+    ##############################################
+    ### section 1 - engineer reasons per label ###
+    ##############################################
 
-    # merge totals into chart df
-    reason_counts = reason_counts.merge(
-        label_totals[["label", "label_with_total"]],
-        on="label",
-        how="left"
+    render_reason_distribution(
+        alignment["engineer_reported_symptom"],
+        "engineer_reported_symptom",
+        warning="Only calls that end in a BBTTE visit have engineer notes. Distributions are for calls with both values. Mapping below.",
+        slider_label="Show top X engineer reported reasons for each label:",
+        key="eng",
+        caption="calls with a BTTEE visit and engineer note  after global filters applied",
+        state_key=state_key
     )
 
-    # build chart
-    reason_chart = (
-        alt.Chart(reason_counts)
-        .mark_bar()
-        .encode(
-            x=alt.X(
-                "label_with_total:N",
-                title="Label (Total Calls)",
-                sort=alt.SortArray(
-                    label_totals[
-                        label_totals["label"].isin(label_order)
-                    ]
-                    .assign(
-                        label_order=lambda df: df["label"].map(
-                            {label: i for i, label in enumerate(label_order)}
-                        )
-                    )
-                    .sort_values(by="label_order")["label_with_total"]
-                    .tolist()
-                ),
-                axis=alt.Axis(labelAngle=0, labelLimit=1000)
-            ),
-            y=alt.Y("pct_of_label:Q", title="% of Label Calls", scale=alt.Scale(domain=[0, 100])),
-            color=alt.Color("first_csg_call_reason:N", title="CSG Reason"),
-            tooltip=[
-                alt.Tooltip("label:N", title="Label"),
-                alt.Tooltip("first_csg_call_reason:N", title="CSG Reason"),
-                alt.Tooltip("pct_of_label:Q", title="% of Label", format=".1f"),
-                alt.Tooltip("count:Q", title="Count")
-            ]
-        )
-        .properties(height=350)
-    )
-
-    st.altair_chart(reason_chart, width='stretch')
-
-    # remaining rows after filtering
-    st.caption(f"{label_totals.total_calls.sum():,} or {round(label_totals.total_calls.sum() / len(df_filtered) * 100, 1)}% calls with a CSG call reason after global filters applied")
-
     st.divider()
 
 
-    ########################################
-    ### section 4 - csg reason alignment ###
-    ########################################
-
-    st.subheader("CSG Call Reason Alignment by Label")
-
-    st.write("\n\n")
-    st.warning("Alignment is calculated only for calls with a mapped CSG call reason.")
-    st.write("\n\n")
-
-    # confidence filter
-    # filter_col, _ = st.columns([3, 7])
-    # with filter_col:
-    with st.expander("Confidence filtering", expanded=False):
-        csg_min_confidence = st.slider(
-            "Minimum LLM-derived confidence score:",
-            min_value=1,
-            max_value=10,
-            value=1,
-            key="csg_alignment_confidence"
-        )
-
-    # mapping dictionary
-    csg_to_llm_map = {
-        "No Connection": "Wi-Fi Status",
-        "Intermittent Connection": "Unreliable Wi-Fi",
-        "Slow Connection": "Slow Wi-Fi",
-    }
-
-    df_working["mapped_llm_label_csg"] = df_working["first_csg_call_reason"].map(csg_to_llm_map)
-
-    # compute alignment based on non-null CSG reasons and confidence filter
-    alignment_base = df_working[
-        (df_working["first_csg_call_reason"].notna()) &
-        (df_working["confidence"] >= csg_min_confidence)
-    ].copy()
-
-    mapped_counts = (
-        alignment_base.dropna(subset=["mapped_llm_label_csg"])
-        .groupby(["label", "mapped_llm_label_csg"])
-        .size()
-        .reset_index(name="mapped_count")
-    )
+    #############################################
+    ### section 2 - engineer reason alignment ###
+    #############################################
 
-    label_totals_reason = (
-        alignment_base.groupby("label")
-        .size()
-        .reset_index(name="label_reason_count")
-    )
+    render_alignment(alignment["engineer_reported_symptom"], "engineer_reported_symptom", key="engineer", state_key=state_key)
 
-    if alignment_base.shape[0] < 50:
-        st.warning("Low sample size — interpret alignment with caution.")
+    st.divider()
 
-    alignment_df = mapped_counts.merge(label_totals_reason, on="label", how="left")
 
-    alignment_df["match_flag"] = alignment_df["label"] == alignment_df["mapped_llm_label_csg"]
-    alignment_df["match_count"] = alignment_df["mapped_count"] * alignment_df["match_flag"]
+    #########################################
+    ### section 3 - csg reasons per label ###
+    #########################################
 
-    alignment_df = (
-        alignment_df.groupby("label")
-        .agg(
-            mapped_count=("mapped_count", "sum"),
-            match_count=("match_count", "sum"),
-            label_reason_count=("label_reason_count", "first")
-        )
-        .reset_index()
+    render_reason_distribution(
+        alignment["first_csg_call_reason"],
+        "first_csg_call_reason",
+        warning="Not all calls have a CSG reason. Distributions are for calls with both values.",
+        slider_label="Top X CSG reasons ::",
+        key="csg",
+        caption="calls with a CSG call reason after global filters applied",
+        state_key=state_key
     )
 
-    alignment_df["alignment_pct"] = (alignment_df["match_count"] / alignment_df["label_reason_count"]) * 100
+    st.divider()
 
-    alignment_chart = (
-        alt.Chart(alignment_df)
-        .mark_bar(color="#5A67D8")
-        .encode(
-            y=alt.Y("label:N", sort="-x", title=None),
-            x=alt.X("alignment_pct:Q", title="Alignment (%)", scale=alt.Scale(domain=[0, 100])),
-            tooltip=[
-                alt.Tooltip("label:N", title="Label"),
-                alt.Tooltip("label_reason_count:Q", title="Calls with CSG Reason"),
-                alt.Tooltip("match_count:Q", title="Mapped Calls"),
-                alt.Tooltip("alignment_pct:Q", title="Alignment %", format=".1f")
-            ]
-        )
-        .properties(height=45 * len(alignment_df))
-    )
 
-    st.altair_chart(alignment_chart, width='stretch')
+    ########################################
+    ### section 4 - csg reason alignment ###
+    ########################################
 
-    with st.expander("Label to CSG Call Reason mapping"):
-        label_to_csg_map = pd.DataFrame(
-            list(csg_to_llm_map.items()),
-            columns=["CSG Call Reason", "Label"]
-        )
-        st.table(label_to_csg_map[["Label", "CSG Call Reason"]])
+    render_alignment(alignment["first_csg_call_reason"], "first_csg_call_reason", key="csg", state_key=state_key)
 
     st.divider()
 
@@ -453,44 +329,82 @@ def render_view(df_filtered):
     ### section 5 - llm confidence ###
     ##################################
 
-    # ensure numeric types
-    df_working["confidence"] = pd.to_numeric(df_working["confidence"], errors="coerce")
+    with span("label_evaluation.llm_confidence"):
+        # bin confidence values from 1-10
+        conf_dist = confidence_table(df_filtered, state_key)
+
+        conf_chart = (
+            alt.Chart(conf_dist)
+            .mark_bar(color="#5A67D8")
+            .encode(
+                x=alt.X("confidence_bin:O", title="Confidence (1–10)"),
+                y=alt.Y("count:Q", title="Calls"),
+                tooltip=[
+                    alt.Tooltip("confidence_bin:O", title="Confidence"),
+                    alt.Tooltip("count:Q", title="Count")
+                ]
+            )
+        )
 
-    # bin confidence values from 1-10
-    df_working["confidence_bin"] = pd.cut(
-        df_working["confidence"],
-        bins=list(range(0, 11)),   # 0-10 edges
-        labels=list(range(1, 11)), # 1-10 labels
-        include_lowest=True,
-        right=True
-    )
+        st.subheader("LLM-derived Confidence Score Distribution (1–10)")
+        st.write("\n\n")
+        st.warning("LLMs are naturally overconfident. Use with caution.")
+        st.write("\n\n")
+        with span("chart"):
+            st.altair_chart(conf_chart, width='stretch')
 
-    conf_dist = (
-        df_working.groupby("confidence_bin", observed=True)
-        .size()
-        .reset_index(name="count")
-    )
+        # remaining rows after filtering
+        st.caption(f"{sum(conf_dist['count']):,} or {round(sum(conf_dist['count']) / max(len(df_filtered), 1) * 100, 1)}% calls with a confidence score after global filters applied")
 
-    conf_chart = (
-        alt.Chart(conf_dist)
-        .mark_bar(color="#5A67D8")
-        .encode(
-            x=alt.X("confidence_bin:O", title="Confidence (1–10)"),
-            y=alt.Y("count:Q", title="Calls"),
-            tooltip=[
-                alt.Tooltip("confidence_bin:O", title="Confidence"),
-                alt.Tooltip("count:Q", title="Count")
-            ]
+    st.divider()
+
+
+    ##########################################
+    ### section 6 - label vs reference mix ###
+    ##########################################
+
+    @section("label_evaluation.reference_mix")
+    def reference_mix():
+        st.subheader("Labels against Reference Values")
+        st.write("\n\n")
+        st.warning("Full label by reference value breakdown for calls with both values, including references without an agreed mapping.")
+        st.write("\n\n")
+
+        filter_col, _ = st.columns([3, 7])
+        with filter_col:
+            reference = st.selectbox(
+                "Reference:",
+                options=list(REFERENCES),
+                format_func=lambda column: REFERENCES[column]["name"],
+                key="confusion_reference"
+            )
+
+        # long label x reference table from the cached counts, as % of each label's calls
+        confusion = mix_table(alignment[reference], reference, state_key)
+
+        short_name = REFERENCES[reference]["short_name"]
+        confusion_chart = (
+            alt.Chart(confusion)
+            .mark_rect()
+            .encode(
+                x=alt.X("reference:N", title=short_name, axis=alt.Axis(labelAngle=-30, labelLimit=300)),
+                y=alt.Y("label:N", title=None),
+                color=alt.Color("pct_of_label:Q", title="% of Label", scale=alt.Scale(scheme="purples")),
+                tooltip=[
+                    alt.Tooltip("label:N", title="Label"),
+                    alt.Tooltip("reference:N", title=short_name),
+                    alt.Tooltip("pct_of_label:Q", title="% of Label", format=".1f"),
+                    alt.Tooltip("count:Q", title="Count")
+                ]
+            )
+            .properties(height=45 * confusion[LABEL].nunique())
         )
-    )
 
-    st.subheader("LLM-derived Confidence Score Distribution (1–10)")
-    st.write("\n\n")
-    st.warning("LLMs are naturally overconfident. Use with caution.")
-    st.write("\n\n")
-    st.altair_chart(conf_chart, width='stretch')
+        with span("chart"):
+            st.altair_chart(confusion_chart, width='stretch')
 
-    # remaining rows after filtering
-    st.caption(f"{sum(conf_dist['count']):,} or {round(sum(conf_dist['count']) / len(df_filtered) * 100, 1)}% calls with a confidence score after global filters applied")
+        st.caption(f"{int(confusion['count'].sum()):,} calls with both a label and {short_name} after global filters applied")
+
+    reference_mix()
 
     st.divider()
\ No newline at end of file
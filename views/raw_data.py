@@ -1,7 +1,47 @@
 import streamlit as st
-import pandas as pd
 
-def render_view(df_filtered):
+from utils.ingest import TEXT_COLUMNS
+from utils.compute import filter_rows, row_order, page_rows, selection_csv
+from utils.result_cache import cached_result
+from utils.selection import RowSelection
+from utils.profiling import section, span
+
+# key columns used across the dashboard
+RAW_COLUMNS = [
+    "label",
+    "long_reason",
+    "evidence",
+    "confidence",
+    "selected_outcome_cleaned",
+    "outcome_cost",
+    "outcome_ts",
+    "sc_call_next_7d_flag",
+    "sc_call_next_7d_days",
+    "bb_churn_next_30d",
+    "bb_churn_next_60d",
+    "call_date"
+]
+
+# columns this view reads from the dataset (text columns are fetched per page)
+COLUMNS = [c for c in RAW_COLUMNS if c not in TEXT_COLUMNS]
+
+# human-readable column names for the table and the csv download
+DISPLAY_NAMES = {
+    "label": "Label",
+    "long_reason": "Reason",
+    "evidence": "Evidence",
+    "confidence": "Confidence",
+    "selected_outcome_cleaned": "Outcome",
+    "outcome_cost": "Outcome Cost (£)",
+    "outcome_ts": "Outcome Timestamp",
+    "sc_call_next_7d_flag": "Repeat Call (7d)",
+    "sc_call_next_7d_days": "Days to Repeat",
+    "bb_churn_next_30d": "Churn (30d)",
+    "bb_churn_next_60d": "Churn (60d)",
+    "call_date": "Call Date"
+}
+
+def render_view(selection, load_search_index, text_data, state_key):
 
     # page text
     st.write("\n\n")
@@ -15,110 +55,153 @@ def render_view(df_filtered):
     ### section 1 - raw data ###
     ############################
 
-    st.subheader("Manual Inspection of Raw Data")
+    @section("raw_data.raw_table")
+    def raw_table(selection):
+        st.subheader("Manual Inspection of Raw Data")
 
-    st.write("\n\n")
-    st.info(
-        "This table is intended for manual inspection and validation. "
-        "It shows the exact rows behind the dashboards, including labels, evidence, outcomes, "
-        "and customer behaviours like repeat calls and churn."
-    )
-    st.write("\n\n")
-
-    # key columns used across the dashboard
-    raw_columns = [
-        "label",
-        "long_reason",
-        "evidence",
-        "confidence",
-        "selected_outcome_cleaned",
-        "outcome_cost",
-        "outcome_ts",
-        "sc_call_next_7d_flag",
-        "sc_call_next_7d_days",
-        "bb_churn_next_30d",
-        "bb_churn_next_60d",
-        "call_date"
-    ]
-
-    raw_columns = [c for c in raw_columns if c in df_filtered.columns]
-
-    # create 3 columns for filters side by side
-    col1, col2, col3 = st.columns(3)
-
-    # search across all columns
-    with col1:
-        search_term = st.text_input(
-            "Text search across all columns (click cells to read full text):",
-            value="",
-            key="raw_search"
+        st.write("\n\n")
+        st.info(
+            "This table is intended for manual inspection and validation. "
+            "It shows the exact rows behind the dashboards, including labels, evidence, outcomes, "
+            "and customer behaviours like repeat calls and churn."
         )
-        
-        if search_term:
-            # search across all columns in the dataframe
-            mask = df_filtered.astype(str).apply(lambda row: row.str.contains(search_term, case=False).any(), axis=1)
-            df_filtered = df_filtered[mask]
-
-    # yes / no dropdown for repeat calls ----
-    with col2:
-        if "sc_call_next_7d_flag" in df_filtered.columns:
-            repeat_filter = st.selectbox(
-                "Repeat call in next 7 days?:",
-                options=["All", "Yes", "No"],
-                key="raw_repeat"
+        st.write("\n\n")
+
+
+        # create 3 columns for filters side by side
+        col1, col2, col3 = st.columns(3)
+
+        # search across all columns
+        with col1:
+            search_term = st.text_input(
+                "Text search across text columns (click cells to read full text):",
+                value="",
+                key="raw_search",
+                help=(
+                    "All words must match. Scope a word to one column with field:word, "
+                    "e.g. evidence:router. Fields: reason, evidence, label, outcome, "
+                    "symptom, cause, action. Use quotes for phrases."
+                )
             )
 
-            if repeat_filter == "Yes":
-                df_filtered = df_filtered[df_filtered["sc_call_next_7d_flag"] == 1]
-            elif repeat_filter == "No":
-                df_filtered = df_filtered[df_filtered["sc_call_next_7d_flag"] == 0]
-
-    # yes / no dropdown for churn ----
-    with col3:
-        if "bb_churn_next_30d" in df_filtered.columns:
-            churn_filter = st.selectbox(
-                "Churn within 30 days?:",
-                options=["All", "Yes", "No"],
-                key="raw_churn"
-            )
+        # yes / no dropdown for repeat calls ----
+        repeat_filter = "All"
+        with col2:
+            if "sc_call_next_7d_flag" in selection.df.columns:
+                repeat_filter = st.selectbox(
+                    "Repeat call in next 7 days?:",
+                    options=["All", "Yes", "No"],
+                    key="raw_repeat"
+                )
+
+        # yes / no dropdown for churn ----
+        churn_filter = "All"
+        with col3:
+            if "bb_churn_next_30d" in selection.df.columns:
+                churn_filter = st.selectbox(
+                    "Churn within 30 days?:",
+                    options=["All", "Yes", "No"],
+                    key="raw_churn"
+                )
+
+        # search via the inverted index (only built once a search needs it), then the repeat /
+        # churn dropdowns; the narrowed row positions are cached, so paging and re-sorting do
+        # not search again
+        row_filters = {"search_term": search_term.strip(), "repeat": repeat_filter, "churn": churn_filter}
+        if row_filters != {"search_term": "", "repeat": "All", "churn": "All"}:
+            selection = RowSelection(selection.df, cached_result(
+                "raw_data.filter_rows",
+                state_key,
+                lambda: filter_rows(
+                    selection, load_search_index() if search_term.strip() else None,
+                    search_term, repeat_filter, churn_filter
+                ).positions,
+                **row_filters
+            ))
+
+        st.write("\n\n")
+
+        # paging and server-side sorting so only the visible window is sent to the browser
+        sort_options = {
+            "None": None,
+            "Call Date": "call_date",
+            "Confidence": "confidence",
+            "Outcome Cost (£)": "outcome_cost",
+            "Days to Repeat": "sc_call_next_7d_days",
+        }
+        sort_options = {k: v for k, v in sort_options.items() if v is None or v in selection.df.columns}
 
-            if churn_filter == "Yes":
-                df_filtered = df_filtered[df_filtered["bb_churn_next_30d"] == 1]
-            elif churn_filter == "No":
-                df_filtered = df_filtered[df_filtered["bb_churn_next_30d"] == 0]
+        page_col1, page_col2, page_col3, page_col4 = st.columns(4)
 
-    st.write("\n\n")
+        with page_col1:
+            sort_label = st.selectbox("Sort by:", options=list(sort_options), key="raw_sort_by")
 
-    # prepare dataframe for display
-    df_display = df_filtered[raw_columns].reset_index(drop=True)
-
-    # rename columns to human-readable names
-    df_display = df_display.rename(columns={
-        "label": "Label",
-        "long_reason": "Reason",
-        "evidence": "Evidence",
-        "confidence": "Confidence",
-        "selected_outcome_cleaned": "Outcome",
-        "outcome_cost": "Outcome Cost (£)",
-        "outcome_ts": "Outcome Timestamp",
-        "sc_call_next_7d_flag": "Repeat Call (7d)",
-        "sc_call_next_7d_days": "Days to Repeat",
-        "bb_churn_next_30d": "Churn (30d)",
-        "bb_churn_next_60d": "Churn (60d)",
-        "call_date": "Call Date"
-    })
-
-    # show raw data table with column configuration for readability
-    st.dataframe(
-        df_display,
-        width='stretch',
-        column_config={
-            "Reason": st.column_config.TextColumn(width="large"),
-            "Evidence": st.column_config.TextColumn(width="large"),
-        }
-    )
+        with page_col2:
+            sort_order = st.selectbox("Sort order:", options=["Descending", "Ascending"], key="raw_sort_order")
+
+        with page_col3:
+            page_size = st.selectbox("Rows per page:", options=[50, 100, 250, 500], index=1, key="raw_page_size")
+
+        total_rows = len(selection)
+        n_pages = max(1, -(-total_rows // page_size))
+
+        # keep the page in range when filters shrink the result
+        if st.session_state.get("raw_page", 1) > n_pages:
+            st.session_state.raw_page = n_pages
+
+        with page_col4:
+            page = st.number_input(f"Page (of {n_pages:,}):", min_value=1, max_value=n_pages, step=1, key="raw_page")
+
+        # row order for the current sort (missing values always last), cached so that paging
+        # does not sort again
+        order = row_order(selection, None)
+        if sort_options[sort_label] is not None:
+            order = cached_result(
+                "raw_data.row_order",
+                state_key,
+                lambda: row_order(selection, sort_options[sort_label], descending=sort_order == "Descending"),
+                **row_filters, sort=sort_options[sort_label], descending=sort_order == "Descending"
+            )
+
+        # materialise only the visible window, with text columns fetched for those rows only
+        start = (page - 1) * page_size
+        stop = min(start + page_size, total_rows)
+        df_display = page_rows(selection, text_data, order, page, page_size, RAW_COLUMNS)
+
+        # rename columns to human-readable names
+        df_display = df_display.rename(columns=DISPLAY_NAMES)
+
+        # show raw data table with column configuration for readability
+        with span("table"):
+            st.dataframe(
+                df_display,
+                width='stretch',
+                column_config={
+                    "Reason": st.column_config.TextColumn(width="large"),
+                    "Evidence": st.column_config.TextColumn(width="large"),
+                    "Outcome Cost (£)": st.column_config.NumberColumn(format="%.2f"),
+                    "Call Date": st.column_config.DateColumn(),
+                }
+            )
+
+        # caption for remaining calls
+        if total_rows:
+            st.caption(f"Showing rows {start + 1:,}–{stop:,} of {total_rows:,} calls remaining after filters applied")
+        else:
+            st.caption("0 calls remaining after filters applied")
+
+        # the table only holds the current page, so the whole filtered selection is exported
+        # here, in the current sort order; the csv is only built when the button is clicked
+        st.download_button(
+            f"Download all {total_rows:,} rows (CSV)",
+            data=lambda: selection_csv(selection, text_data, order, RAW_COLUMNS, DISPLAY_NAMES),
+            file_name="raw_label_data.csv",
+            mime="text/csv",
+            on_click="ignore",
+            disabled=not total_rows,
+            key="raw_download"
+        )
 
-    # caption for remaining calls
-    st.caption(f"{len(df_filtered):,} calls remaining after filters applied")
+    raw_table(selection)
 
     st.divider()
\ No newline at end of file